@@ -43,7 +43,13 @@ async def send_message(
             "generate_audio": false
         }
     """
+    context_task = None
     try:
+        # Start RAG retrieval so the embedding request overlaps the DB work below
+        use_rag = getattr(request, 'use_rag', True)  # RAG enabled by default
+        if use_rag:
+            context_task = await rag_service.prefetch_context(request.message)
+
         # Get or create conversation
         conversation = await conversation_manager.get_or_create_conversation(
             db=db,
@@ -68,12 +74,12 @@ async def send_message(
         system_prompt = prompt_service.render_prompt(prompt_content)
 
         # Generate response with RAG (if enabled)
-        use_rag = getattr(request, 'use_rag', True)  # RAG enabled by default
         rag_response = await rag_service.answer_with_context(
             query=request.message,
             conversation_history=history,
             system_prompt=system_prompt,
-            use_rag=use_rag
+            use_rag=use_rag,
+            context_task=context_task
         )
 
         # Extract response content and metadata
@@ -81,7 +87,10 @@ async def send_message(
         latency_ms = rag_response.get("usage", {}).get("latency_ms", 0)
 
         # Debug: log the response
-        logger.info(f"RAG response: '{response_content}' (RAG used: {rag_response['rag_used']}, chunks: {rag_response['context_chunks']})")
+        logger.info(
+            "RAG response: '%s' (RAG used: %s, chunks: %s)",
+            response_content, rag_response['rag_used'], rag_response['context_chunks']
+        )
 
         # Save user message
         await conversation_manager.add_message(
@@ -113,6 +122,8 @@ async def send_message(
         )
 
     except Exception as e:
+        if context_task and not context_task.done():
+            context_task.cancel()
         logger.error(f"Error in send_message: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
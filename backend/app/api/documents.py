@@ -86,7 +86,7 @@ async def process_document_task(document_id: str, db: Session):
 
         if chunks:
             # Index chunks in vector store
-            await rag_service.index_document_chunks(chunks, db)
+            await rag_service.index_document_chunks(chunks)
 
         logger.info(f"✅ Document {document.name} fully processed and indexed")
 
@@ -7,6 +7,7 @@ With rate limiting protection
 import asyncio
 import logging
 import uuid
+from contextlib import aclosing
 from typing import Dict
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
@@ -23,6 +24,9 @@ router = APIRouter()
 # Active calls
 active_calls: Dict[str, dict] = {}
 
+# Agent config is identical for every call - validate it once at import
+AGENT_CONFIG = HostessAgentConfig(use_rag=True)
+
 
 @router.post("/start")
 async def start_call() -> JSONResponse:
@@ -71,7 +75,7 @@ async def websocket_call(websocket: WebSocket, call_id: str):
     synthesizer_config = YandexSynthesizerConfig(voice="alena")
     synthesizer = YandexSynthesizer(synthesizer_config)
 
-    agent_config = HostessAgentConfig(use_rag=True)
+    agent_config = AGENT_CONFIG
     agent = HostessAgent(agent_config)
 
     # Start transcriber
@@ -92,9 +96,10 @@ async def websocket_call(websocket: WebSocket, call_id: str):
                 chunk_size=2048
             )
 
-            # Send audio chunks
-            async for audio_chunk in synthesis_result.chunk_generator:
-                await websocket.send_bytes(audio_chunk)
+            # Send audio chunks (a failed send closes the stream right away)
+            async with aclosing(synthesis_result.chunk_generator) as chunks:
+                async for audio_chunk in chunks:
+                    await websocket.send_bytes(audio_chunk)
 
         # Main loop
         while True:
@@ -158,33 +163,22 @@ async def websocket_call(websocket: WebSocket, call_id: str):
                             "text": user_text
                         })
 
-                        # Get agent response with timeout
-                        response_text, end_conversation = await asyncio.wait_for(
-                            agent.respond(
-                                human_input=user_text,
-                                conversation_id=call_id
-                            ),
-                            timeout=30.0  # 30 second timeout for LLM response
+                        # Stream the agent response: each sentence is spoken
+                        # while the LLM is still generating the next one
+                        response_text = await _speak_agent_response(
+                            websocket, agent, synthesizer, user_text, call_id
                         )
+                        end_conversation = agent.should_end_conversation(response_text)
 
                         logger.info(f"Agent: {response_text}")
 
-                        # Send response text
+                        # Send the full response text (sentences were already
+                        # sent one by one as response_chunk)
                         await websocket.send_json({
                             "type": "response",
                             "text": response_text
                         })
 
-                        # Synthesize response
-                        synthesis_result = await synthesizer.create_speech_uncached(
-                            message=response_text,
-                            chunk_size=2048
-                        )
-
-                        # Send audio chunks
-                        async for audio_chunk in synthesis_result.chunk_generator:
-                            await websocket.send_bytes(audio_chunk)
-
                         if end_conversation:
                             logger.info("Ending conversation")
                             break
@@ -210,9 +204,15 @@ async def websocket_call(websocket: WebSocket, call_id: str):
         # Release rate limit connection
         rate_limiter.release_connection(client_id)
 
-        # Stop transcriber
-        transcriber._ended = True
-        transcriber_task.cancel()
+        # Stop transcriber (wakes its loop via the queue sentinel) and wait
+        # for the loop to exit; wait_for cancels it if it doesn't in time
+        transcriber.terminate()
+        try:
+            await asyncio.wait_for(transcriber_task, timeout=1.0)
+        except asyncio.TimeoutError:
+            logger.warning(f"Transcriber did not stop in time for call {call_id}, cancelled")
+        except Exception as e:
+            logger.error(f"Error stopping transcriber: {e}")
 
         try:
             await websocket.close()
@@ -220,6 +220,79 @@ async def websocket_call(websocket: WebSocket, call_id: str):
             pass
 
 
+async def _speak_agent_response(
+    websocket: WebSocket,
+    agent: HostessAgent,
+    synthesizer: YandexSynthesizer,
+    user_text: str,
+    call_id: str,
+) -> str:
+    """
+    Stream the agent's response sentence by sentence into speech
+
+    The agent's sentence stream is consumed by a separate task, so LLM
+    generation keeps going while earlier sentences are synthesized and sent.
+    The queue holds one sentence: the agent runs at most a sentence ahead of
+    playback, so an interrupted turn isn't recorded with text never played.
+    Each sentence's text is sent as a response_chunk message before its audio.
+
+    Returns:
+        Full response text
+    """
+    sentences: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    async def produce():
+        try:
+            # aclosing: if we're cancelled, the agent records the partial turn now
+            async with aclosing(agent.generate_response(
+                human_input=user_text,
+                conversation_id=call_id
+            )) as messages:
+                async for message in messages:
+                    await sentences.put(message.message.text)
+        except Exception as e:
+            logger.error(f"Error generating response for call {call_id}: {e}")
+        # End marker; not reached when the consumer cancels us, so a full
+        # queue can't leave this task blocked
+        await sentences.put(None)
+
+    producer = asyncio.create_task(produce())
+    parts = []
+
+    try:
+        while True:
+            # 30 second timeout for the next piece of the LLM response
+            sentence = await asyncio.wait_for(sentences.get(), timeout=30.0)
+            if sentence is None:
+                break
+            parts.append(sentence)
+
+            # Text first, so the client can show it before the audio arrives
+            await websocket.send_json({
+                "type": "response_chunk",
+                "text": sentence
+            })
+
+            synthesis_result = await synthesizer.create_speech_uncached(
+                message=sentence,
+                chunk_size=2048
+            )
+
+            # Send audio chunks (a failed send closes the stream right away)
+            async with aclosing(synthesis_result.chunk_generator) as chunks:
+                async for audio_chunk in chunks:
+                    await websocket.send_bytes(audio_chunk)
+
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+            # Let the agent record the partial turn before the next one starts
+            await asyncio.wait([producer])
+
+    return " ".join(parts)
+
+
 @router.get("/status/{call_id}")
 async def get_call_status(call_id: str):
     """Get call status"""
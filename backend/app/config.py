@@ -32,6 +32,7 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
     YANDEX_API_KEY: Optional[str] = None
     YANDEX_FOLDER_ID: Optional[str] = None
+    YANDEX_SYNTH_CONCURRENCY: int = 4  # Max in-flight Vocode syntheses per process
 
     # Restaurant Information
     RESTAURANT_NAME: str = "Гастрономия"
@@ -46,6 +47,10 @@ class Settings(BaseSettings):
     RAG_CHUNK_OVERLAP: int = 50
     RAG_TOP_K: int = 5
     RAG_MIN_SCORE: float = 0.7
+    # Max cosine distance of a chunk sent to the LLM, per embedding provider
+    # (score scales differ between models); None disables the filter
+    RAG_MAX_DISTANCE_OPENAI: Optional[float] = 0.65
+    RAG_MAX_DISTANCE_YANDEX: Optional[float] = 0.6
 
     # Vocode Configuration (for future use)
     VOCODE_API_KEY: Optional[str] = None
@@ -20,6 +20,9 @@ LLM_PROVIDER_CLAUDE = "claude"
 LLM_PROVIDER_OPENAI = "openai"
 LLM_PROVIDER_YANDEX = "yandex"
 
+# Voice call greeting (also pre-synthesized into the TTS cache at startup)
+GREETING_MESSAGE = "Добрый день! Ресторан Гастрономия, чем могу помочь?"
+
 # Default LLM settings
 DEFAULT_MAX_TOKENS = 500
 DEFAULT_TEMPERATURE = 0.7
@@ -6,6 +6,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
 import os
 import logging
 
@@ -39,11 +40,45 @@ async def lifespan(app: FastAPI):
     await prompt_service.initialize_default_prompt()
     logger.info("✅ Default prompt initialized")
 
+    # Pre-synthesize the call greeting and open connections to Yandex for the
+    # Vocode providers in the background (doesn't block startup)
+    from app.core.constants import GREETING_MESSAGE
+    from app.services.yandex_streaming_tts import yandex_streaming_tts_service
+    from app.vocode_providers import http_session
+    warm_ups = [yandex_streaming_tts_service.warm_up([GREETING_MESSAGE])]
+    if settings.YANDEX_API_KEY:
+        warm_ups.append(http_session.warm_up())
+    warm_up_task = asyncio.gather(*warm_ups)
+
     yield
 
     # Shutdown
     logger.info("👋 Shutting down API...")
 
+    if not warm_up_task.done():
+        warm_up_task.cancel()
+
+    # Write call messages still queued for the batched insert
+    from app.services.message_writer import message_writer
+    await message_writer.aclose()
+
+    # Close shared HTTP clients while the event loop is still running
+    from app.services.embeddings_provider import embeddings
+    from app.services.yandex_stt import yandex_stt_service
+    from app.services.yandex_tts import yandex_tts_service
+    from app.services.webrtc_sip_service import webrtc_sip_service
+    for service in (
+        embeddings,
+        yandex_stt_service,
+        yandex_tts_service,
+        yandex_streaming_tts_service,
+        webrtc_sip_service,
+    ):
+        await service.aclose()
+
+    from app.vocode_providers.http_session import close_session
+    await close_session()
+
 
 # Create FastAPI application
 app = FastAPI(
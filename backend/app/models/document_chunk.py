@@ -2,7 +2,7 @@
 DocumentChunk model for RAG text chunks with embeddings
 """
 
-from sqlalchemy import Column, String, Text, Integer, ForeignKey
+from sqlalchemy import Column, Text, Integer, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -12,7 +12,8 @@ from app.models.base import BaseModel
 class DocumentChunk(BaseModel):
     """
     Model for storing text chunks from documents.
-    Each chunk is indexed in ChromaDB with its vector embedding.
+    Each chunk is indexed in ChromaDB with its vector embedding,
+    using the chunk id as the ChromaDB id.
     """
 
     __tablename__ = "document_chunks"
@@ -37,14 +38,6 @@ class DocumentChunk(BaseModel):
         comment="Text content of this chunk"
     )
 
-    chromadb_id = Column(
-        String(100),
-        nullable=True,
-        unique=True,
-        index=True,
-        comment="ID in ChromaDB for this chunk"
-    )
-
     token_count = Column(
         Integer,
         nullable=True,
@@ -2,7 +2,7 @@
 Prompt model for storing system prompts
 """
 
-from sqlalchemy import Column, String, Text, Boolean, Integer
+from sqlalchemy import Column, String, Text, Boolean, Integer, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.models.base import BaseModel
@@ -16,6 +16,11 @@ class Prompt(BaseModel):
 
     __tablename__ = "prompts"
 
+    __table_args__ = (
+        # Partial index for active-prompt lookups by name
+        Index("ix_prompts_active_system", "name", postgresql_where=text("is_active")),
+    )
+
     name = Column(
         String(100),
         nullable=False,
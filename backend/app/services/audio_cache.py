@@ -0,0 +1,67 @@
+"""
+In-memory LRU cache for synthesized audio
+Repeated utterances (greeting, confirmations) are served from memory
+instead of another TTS round trip
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+import xxhash
+
+logger = logging.getLogger(__name__)
+
+
+class AudioCache:
+    """
+    LRU cache of audio bytes bounded by total payload size.
+
+    Keys are 128-bit xxh3 hashes of the synthesis parameters, so long
+    texts don't stay resident as dict keys. Not thread-safe: meant to be
+    used from the event loop only.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Total audio bytes kept before evicting least recently used
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, bytes]" = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def make_key(*parts) -> int:
+        """
+        Build a cache key from synthesis parameters (text, voice, ...).
+        xxh3 is non-cryptographic, which is all an in-process cache needs,
+        and much cheaper than a cryptographic digest on short texts.
+        """
+        return xxhash.xxh3_128_intdigest("\x1f".join(map(str, parts)).encode())
+
+    def get(self, key: int) -> Optional[bytes]:
+        """Return cached audio and mark it recently used, or None"""
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+        return audio
+
+    def put(self, key: int, audio: bytes) -> None:
+        """Store audio, evicting least recently used entries over budget"""
+        if not audio or len(audio) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+
+        self._entries[key] = audio
+        self._size += len(audio)
+
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -3,6 +3,7 @@ Document processing service for RAG
 Handles file upload, parsing, and text chunking
 """
 
+import asyncio
 import os
 import io
 import logging
@@ -171,6 +172,15 @@ class DocumentProcessor:
         logger.info(f"Created {len(chunks)} chunks from {total_tokens} tokens")
         return chunks
 
+    def _extract_and_chunk(self, file_path: str, doc_type: DocumentType) -> List[Tuple[str, int]]:
+        """Parse a file and split it into chunks (CPU-bound, runs in a worker thread)"""
+        text = self.extract_text(file_path, doc_type)
+
+        if not text.strip():
+            raise ValueError("No text content extracted from document")
+
+        return self.chunk_text(text)
+
     async def process_document(
         self,
         document: Document,
@@ -188,15 +198,12 @@ class DocumentProcessor:
             document.status = DocumentStatus.PROCESSING
             db.commit()
 
-            # Extract text
+            # Extract text and create chunks. PDF/DOCX parsing and tokenizing
+            # a large document can take seconds, so keep it off the event loop.
             logger.info(f"Processing document: {document.name}")
-            text = self.extract_text(document.file_path, document.doc_type)
-
-            if not text.strip():
-                raise ValueError("No text content extracted from document")
-
-            # Create chunks
-            chunks = self.chunk_text(text)
+            chunks = await asyncio.to_thread(
+                self._extract_and_chunk, document.file_path, document.doc_type
+            )
 
             # Save chunks to database
             for idx, (chunk_text, token_count) in enumerate(chunks):
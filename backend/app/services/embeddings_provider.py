@@ -0,0 +1,15 @@
+"""
+Embeddings provider selected by configuration
+
+Only the configured provider's module is imported, so the unused client
+is never created.
+"""
+
+from app.config import settings
+
+if settings.EMBEDDINGS_PROVIDER == "yandex":
+    from app.services.yandex_embeddings_service import yandex_embeddings_service as embeddings
+else:
+    from app.services.embeddings_service import embeddings_service as embeddings
+
+__all__ = ["embeddings"]
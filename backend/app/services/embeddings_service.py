@@ -1,10 +1,16 @@
 """
 Embeddings service for generating vector representations of text
 Uses OpenAI embeddings API
+
+All returned embeddings are L2-normalized float32 vectors, so cosine
+similarity between two of them is a plain dot product (`mat @ q`).
 """
 
+import asyncio
 import logging
 from typing import List
+import httpx
+import numpy as np
 from openai import AsyncOpenAI
 
 from app.config import settings
@@ -16,11 +22,20 @@ class EmbeddingsService:
     """Service for generating text embeddings using OpenAI"""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        # HTTP/2 lets concurrent embedding requests share one connection
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=100),
+                timeout=30.0
+            )
+        )
         self.model = "text-embedding-3-small"  # 1536 dimensions, cheap and fast
         self.dimensions = 1536
+        self.max_concurrent_batches = 8
 
-    async def generate_embedding(self, text: str) -> List[float]:
+    async def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text
 
@@ -28,7 +43,7 @@ class EmbeddingsService:
             text: Input text
 
         Returns:
-            List[float]: Embedding vector
+            np.ndarray: Unit-length float32 embedding vector
         """
         try:
             response = await self.client.embeddings.create(
@@ -36,7 +51,8 @@ class EmbeddingsService:
                 input=text
             )
 
-            embedding = response.data[0].embedding
+            embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+            embedding /= np.linalg.norm(embedding) + 1e-12
             logger.debug(f"Generated embedding for text: '{text[:50]}...'")
 
             return embedding
@@ -45,7 +61,7 @@ class EmbeddingsService:
             logger.error(f"Failed to generate embedding: {e}")
             raise
 
-    async def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts in batch
 
@@ -53,34 +69,46 @@ class EmbeddingsService:
             texts: List of input texts
 
         Returns:
-            List[List[float]]: List of embedding vectors
+            np.ndarray: (len(texts), dimensions) matrix of unit-length float32 rows
         """
         try:
             # OpenAI allows up to 2048 inputs per request
             batch_size = 2048
 
-            all_embeddings = []
-
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
+            # Batches are sent concurrently, bounded to stay within rate limits
+            semaphore = asyncio.Semaphore(self.max_concurrent_batches)
 
-                response = await self.client.embeddings.create(
-                    model=self.model,
-                    input=batch
-                )
+            async def embed_batch(start: int) -> List[List[float]]:
+                async with semaphore:
+                    response = await self.client.embeddings.create(
+                        model=self.model,
+                        input=texts[start:start + batch_size]
+                    )
 
                 batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
+                logger.info(f"Generated {len(batch_embeddings)} embeddings (batch {start // batch_size + 1})")
+                return batch_embeddings
 
-                logger.info(f"Generated {len(batch_embeddings)} embeddings (batch {i // batch_size + 1})")
+            # gather preserves batch order
+            batches = await asyncio.gather(
+                *(embed_batch(i) for i in range(0, len(texts), batch_size))
+            )
+            all_embeddings = [embedding for batch in batches for embedding in batch]
+
+            embeddings = np.asarray(all_embeddings, dtype=np.float32).reshape(-1, self.dimensions)
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
 
-            logger.info(f"✅ Generated {len(all_embeddings)} embeddings total")
-            return all_embeddings
+            logger.info(f"✅ Generated {len(embeddings)} embeddings total")
+            return embeddings
 
         except Exception as e:
             logger.error(f"Failed to generate embeddings batch: {e}")
             raise
 
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client (called on application shutdown)"""
+        await self.client.close()
+
 
 # Create singleton instance
 embeddings_service = EmbeddingsService()
@@ -0,0 +1,89 @@
+"""
+Retry helper for transient upstream HTTP failures
+Retries connection errors and 429/5xx-gateway responses with jittered
+exponential backoff, honoring Retry-After when the server sends one
+"""
+
+import logging
+from typing import Awaitable, Callable
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses that signal congestion rather than a bad request
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Upper bound on a server-provided Retry-After (seconds) - this is a voice turn
+MAX_RETRY_AFTER = 2.0
+
+_backoff = wait_random_exponential(multiplier=0.1, max=0.8)
+
+
+class RetryableStatusError(httpx.HTTPStatusError):
+    """Transient error status that is worth retrying"""
+
+
+def _wait(retry_state: RetryCallState) -> float:
+    """Use Retry-After if present (capped), otherwise jittered backoff"""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, RetryableStatusError):
+        retry_after = exc.response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_RETRY_AFTER)
+            except ValueError:
+                pass  # HTTP-date form - fall back to backoff
+    return _backoff(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    logger.warning(
+        "Retrying upstream request (attempt %d): %s",
+        retry_state.attempt_number, retry_state.outcome.exception()
+    )
+
+
+async def send_with_retry(
+    send: Callable[[], Awaitable[httpx.Response]],
+    attempts: int = 3
+) -> httpx.Response:
+    """
+    Send a request, retrying transient failures
+
+    Args:
+        send: Zero-argument callable issuing the request
+        attempts: Total attempts including the first
+
+    Returns:
+        The response (non-retryable error statuses are returned as-is,
+        so callers still use raise_for_status)
+
+    Raises:
+        httpx.TransportError or RetryableStatusError once attempts run out
+    """
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(attempts),
+        wait=_wait,
+        retry=retry_if_exception_type((httpx.TransportError, RetryableStatusError)),
+        before_sleep=_log_retry,
+        reraise=True,
+    ):
+        with attempt:
+            response = await send()
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                # Release the connection (matters for streamed responses)
+                await response.aclose()
+                raise RetryableStatusError(
+                    f"Retryable status {response.status_code} from {response.request.url}",
+                    request=response.request,
+                    response=response,
+                )
+    return response
@@ -3,7 +3,8 @@ LLM Service for generating responses using various AI providers
 Supports: Claude (Anthropic), OpenAI GPT-4, Yandex GPT
 """
 
-from typing import List, Dict, Optional
+from typing import AsyncGenerator, List, Dict, Optional
+import json
 import anthropic
 import openai
 import httpx
@@ -42,6 +43,10 @@ class LLMService:
                 self.anthropic_client = anthropic.Anthropic(
                     api_key=settings.ANTHROPIC_API_KEY
                 )
+                # Async client for token streaming
+                self.anthropic_async_client = anthropic.AsyncAnthropic(
+                    api_key=settings.ANTHROPIC_API_KEY
+                )
                 logger.info("✅ Claude (Anthropic) client initialized")
 
             elif self.provider == LLM_PROVIDER_OPENAI:
@@ -161,6 +166,67 @@ class LLMService:
             logger.error(f"❌ LLM generation error ({self.provider}): {e}")
             raise
 
+    async def stream_response(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        temperature: float = DEFAULT_TEMPERATURE
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream response from LLM as text deltas.
+
+        Same arguments as generate_response, but yields text as soon as the
+        provider emits it instead of waiting for the full completion.
+
+        Yields:
+            Text deltas in generation order
+
+        Raises:
+            Exception: If LLM generation fails
+        """
+        if conversation_history is None:
+            conversation_history = []
+
+        # Use provided system prompt or loaded one
+        prompt = system_prompt or self._current_prompt
+        if not prompt:
+            raise ValueError("No system prompt loaded. Call load_prompt() first.")
+
+        # Add current message to history
+        messages = conversation_history + [
+            {"role": "user", "content": message}
+        ]
+
+        if self.provider == LLM_PROVIDER_CLAUDE:
+            stream = self._generate_claude_stream(prompt, messages, max_tokens, temperature)
+        elif self.provider == LLM_PROVIDER_OPENAI:
+            stream = self._generate_openai_stream(prompt, messages, max_tokens, temperature)
+        elif self.provider == LLM_PROVIDER_YANDEX:
+            stream = self._generate_yandex_stream(prompt, messages, max_tokens, temperature)
+        else:
+            raise ValueError(f"Unknown provider: {self.provider}")
+
+        start_time = time.time()
+        first_token_ms = None
+
+        try:
+            async for delta in stream:
+                if first_token_ms is None:
+                    first_token_ms = int((time.time() - start_time) * 1000)
+                yield delta
+
+            latency_ms = int((time.time() - start_time) * 1000)
+            logger.info(
+                f"✅ Streamed response in {latency_ms}ms "
+                f"(first token {first_token_ms}ms) using {self.provider}"
+            )
+
+        except Exception as e:
+            logger.error(f"❌ LLM streaming error ({self.provider}): {e}")
+            raise
+
     async def _generate_claude(
         self,
         system_prompt: str,
@@ -183,6 +249,29 @@ class LLMService:
             logger.error(f"Claude API error: {e}")
             raise
 
+    async def _generate_claude_stream(
+        self,
+        system_prompt: str,
+        messages: List[Dict],
+        max_tokens: int,
+        temperature: float
+    ) -> AsyncGenerator[str, None]:
+        """Stream response using Claude (Anthropic)"""
+        try:
+            async with self.anthropic_async_client.messages.stream(
+                model="claude-sonnet-4-20250514",
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system_prompt,
+                messages=messages
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
+        except anthropic.APIError as e:
+            logger.error(f"Claude API error: {e}")
+            raise
+
     async def _generate_openai(
         self,
         system_prompt: str,
@@ -207,6 +296,34 @@ class LLMService:
             logger.error(f"OpenAI API error: {e}")
             raise
 
+    async def _generate_openai_stream(
+        self,
+        system_prompt: str,
+        messages: List[Dict],
+        max_tokens: int,
+        temperature: float
+    ) -> AsyncGenerator[str, None]:
+        """Stream response using OpenAI GPT-4"""
+        try:
+            response = await openai.ChatCompletion.acreate(
+                model="gpt-4",
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    *messages
+                ],
+                stream=True
+            )
+            async for chunk in response:
+                content = chunk.choices[0].delta.get("content")
+                if content:
+                    yield content
+
+        except openai.error.OpenAIError as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
+
     async def _generate_yandex(
         self,
         system_prompt: str,
@@ -215,6 +332,71 @@ class LLMService:
         temperature: float
     ) -> str:
         """Generate response using Yandex GPT"""
+        url, headers, data = self._build_yandex_request(
+            system_prompt, messages, max_tokens, temperature, stream=False
+        )
+
+        try:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                response = await client.post(url, headers=headers, json=data)
+                response.raise_for_status()
+                result = response.json()
+
+                # Debug: log the full response
+                logger.debug("Yandex GPT response: %s", result)
+
+                # Extract text from Yandex response format
+                response_text = result["result"]["alternatives"][0]["message"]["text"]
+                logger.debug("Extracted text: %s", response_text)
+                return response_text
+
+        except httpx.HTTPError as e:
+            logger.error(f"Yandex GPT API error: {e}")
+            if hasattr(e, 'response') and e.response is not None:
+                logger.error(f"Response body: {e.response.text}")
+            raise
+
+    async def _generate_yandex_stream(
+        self,
+        system_prompt: str,
+        messages: List[Dict],
+        max_tokens: int,
+        temperature: float
+    ) -> AsyncGenerator[str, None]:
+        """Stream response using Yandex GPT"""
+        url, headers, data = self._build_yandex_request(
+            system_prompt, messages, max_tokens, temperature, stream=True
+        )
+
+        try:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                async with client.stream("POST", url, headers=headers, json=data) as response:
+                    response.raise_for_status()
+
+                    # Each line is a JSON object with the full text generated so far
+                    emitted = 0
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        result = json.loads(line)
+                        text = result["result"]["alternatives"][0]["message"]["text"]
+                        if len(text) > emitted:
+                            yield text[emitted:]
+                            emitted = len(text)
+
+        except httpx.HTTPError as e:
+            logger.error(f"Yandex GPT API error: {e}")
+            raise
+
+    def _build_yandex_request(
+        self,
+        system_prompt: str,
+        messages: List[Dict],
+        max_tokens: int,
+        temperature: float,
+        stream: bool
+    ) -> tuple[str, Dict, Dict]:
+        """Build URL, headers and body for a Yandex GPT completion request"""
         url = "https://llm.api.cloud.yandex.net/foundationModels/v1/completion"
 
         headers = {
@@ -236,32 +418,14 @@ class LLMService:
         data = {
             "modelUri": f"gpt://{settings.YANDEX_FOLDER_ID}/yandexgpt/latest",
             "completionOptions": {
-                "stream": False,
+                "stream": stream,
                 "temperature": temperature,
                 "maxTokens": str(max_tokens)
             },
             "messages": yandex_messages
         }
 
-        try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(url, headers=headers, json=data)
-                response.raise_for_status()
-                result = response.json()
-
-                # Debug: log the full response
-                logger.debug(f"Yandex GPT response: {result}")
-
-                # Extract text from Yandex response format
-                response_text = result["result"]["alternatives"][0]["message"]["text"]
-                logger.debug(f"Extracted text: {response_text}")
-                return response_text
-
-        except httpx.HTTPError as e:
-            logger.error(f"Yandex GPT API error: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response body: {e.response.text}")
-            raise
+        return url, headers, data
 
 
 # Create singleton instance
@@ -0,0 +1,153 @@
+"""
+Batched message persistence
+Voice calls hand finished turns to one background writer, which stores the
+turns of all live conversations with a single multi-row INSERT per batch
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.database import SessionLocal
+from app.models.message import Message
+from app.core.constants import MESSAGE_ROLE_USER, MESSAGE_ROLE_ASSISTANT
+
+logger = logging.getLogger(__name__)
+
+
+class MessageWriter:
+    """
+    Background writer that coalesces message INSERTs across conversations.
+
+    Rows are stamped with created_at when the turn is queued (a batch shares
+    one transaction, so the server-side now() would not order its turns).
+    Not thread-safe: meant to be used from the event loop only.
+    """
+
+    def __init__(self, max_batch: int = 128, max_wait: float = 0.05, max_pending: int = 1024):
+        """
+        Args:
+            max_batch: Rows written per INSERT at most
+            max_wait: Seconds the first queued row waits for more to join its batch
+            max_pending: Queued rows above which turns are written directly
+                (backpressure on the caller instead of unbounded memory)
+        """
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_started(self) -> None:
+        """Start the writer task on first use inside the event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def save_turn(
+        self,
+        conversation_id: uuid.UUID,
+        user_input: str,
+        assistant_response: str
+    ) -> None:
+        """
+        Queue a user message and the assistant's reply for writing
+
+        Args:
+            conversation_id: Conversation the messages belong to
+            user_input: User message text
+            assistant_response: Assistant reply text
+        """
+        created_at = datetime.now(timezone.utc)
+        rows = [
+            {
+                "conversation_id": conversation_id,
+                "role": MESSAGE_ROLE_USER,
+                "content": user_input,
+                "created_at": created_at,
+            },
+            {
+                "conversation_id": conversation_id,
+                "role": MESSAGE_ROLE_ASSISTANT,
+                "content": assistant_response,
+                # Keeps the reply after the question when sorted by created_at
+                "created_at": created_at + timedelta(microseconds=1),
+            },
+        ]
+
+        self._ensure_started()
+        if self._queue.maxsize - self._queue.qsize() < len(rows):
+            logger.warning("Message writer backlog full, writing turn directly")
+            await asyncio.to_thread(self._insert, rows)
+            return
+
+        for row in rows:
+            self._queue.put_nowait(row)
+
+    async def _run(self) -> None:
+        """Collect queued rows into batches and write each in a worker thread"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            row = await self._queue.get()
+            # None is the shutdown sentinel put by aclose()
+            if row is None:
+                return
+            rows = [row]
+
+            # Give concurrent calls a moment to add their turns to this batch
+            deadline = loop.time() + self.max_wait
+            while len(rows) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                rows.append(row)
+
+            await self._write_batch(rows)
+
+    async def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Write a batch, falling back to one row at a time if it fails"""
+        try:
+            await asyncio.to_thread(self._insert, rows)
+            logger.debug("Saved %d messages", len(rows))
+            return
+        except Exception as e:
+            logger.error("Error saving message batch: %s", e)
+
+        # One bad row (e.g. a conversation that was never created) must not
+        # drop the other conversations' messages
+        for row in rows:
+            try:
+                await asyncio.to_thread(self._insert, [row])
+            except Exception as e:
+                logger.error("Error saving message for conversation %s: %s", row['conversation_id'], e)
+
+    @staticmethod
+    def _insert(rows: List[Dict[str, Any]]) -> None:
+        """Insert rows with one executemany INSERT in one transaction"""
+        with SessionLocal() as db, db.begin():
+            db.execute(insert(Message), rows)
+
+    async def aclose(self) -> None:
+        """Write everything still queued and stop (called on application shutdown)"""
+        if self._task is None or self._task.done():
+            return
+
+        # The sentinel queues behind pending rows, so they are written first
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+
+# Create singleton instance
+message_writer = MessageWriter()
@@ -2,10 +2,13 @@
 Prompt Service for managing system prompts in database
 """
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from datetime import datetime
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 import logging
+import re
+import threading
 
 from app.models.prompt import Prompt
 from app.core.default_prompts import DEFAULT_SYSTEM_PROMPT
@@ -15,6 +18,27 @@ from app.database import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Template variables supported in prompts
+PROMPT_VARIABLES = (
+    "{date}",
+    "{time}",
+    "{restaurant_name}",
+    "{restaurant_phone}",
+    "{restaurant_address}",
+)
+
+# Matches any supported variable, so rendering is a single pass over the template
+_VAR_RE = re.compile("|".join(map(re.escape, PROMPT_VARIABLES)))
+
+# Variables that change between requests; the rest are baked in once per prompt
+_DYNAMIC_VAR_RE = re.compile(r"\{date\}|\{time\}")
+
+# Built once so SQLAlchemy's compiled-statement cache is reused on every lookup
+_ACTIVE_PROMPT_STMT = select(Prompt.content).where(
+    Prompt.name == PROMPT_TYPE_SYSTEM,
+    Prompt.is_active.is_(True)
+).limit(1)
+
 
 class PromptService:
     """
@@ -23,7 +47,20 @@ class PromptService:
     """
 
     def __init__(self):
+        # Guards the cached prompt fields; set once the cache has been filled
+        self._lock = threading.RLock()
+        self._loaded = threading.Event()
+
         self._cached_prompt: Optional[str] = None
+        # Cached prompt with static (restaurant) variables already substituted
+        self._baked_prompt: Optional[str] = None
+        # (minute key, date string, time string) - strftime runs once per minute
+        self._time_cache: Optional[Tuple[int, str, str]] = None
+
+        # Restaurant settings, read once instead of on every render
+        self._restaurant_name: str = settings.RESTAURANT_NAME
+        self._restaurant_phone: str = settings.RESTAURANT_PHONE
+        self._restaurant_address: str = settings.RESTAURANT_ADDRESS
 
     async def initialize_default_prompt(self) -> None:
         """
@@ -72,15 +109,12 @@ class PromptService:
             Prompt content or None
         """
         try:
-            prompt = db.query(Prompt).filter(
-                Prompt.name == PROMPT_TYPE_SYSTEM,
-                Prompt.is_active == True
-            ).first()
+            content = db.execute(_ACTIVE_PROMPT_STMT).scalar_one_or_none()
 
-            if prompt:
-                self._cached_prompt = prompt.content
-                logger.debug(f"Loaded prompt (version {prompt.version})")
-                return prompt.content
+            if content:
+                self._cache_prompt(content)
+                logger.debug(f"Loaded prompt ({len(content)} chars)")
+                return content
             else:
                 logger.warning("No active system prompt found")
                 return None
@@ -94,30 +128,35 @@ class PromptService:
         Synchronous version of get_active_prompt.
         Used by LLM service initialization.
 
+        The cache is filled at startup by initialize_default_prompt, so this
+        is an in-memory read; the database is only hit if called before that.
+
         Returns:
             Cached prompt content or None
         """
-        if self._cached_prompt:
+        if not self._loaded.is_set():
+            self._load_sync()
+
+        with self._lock:
             return self._cached_prompt
 
-        # Load from database if not cached
-        db = SessionLocal()
-        try:
-            prompt = db.query(Prompt).filter(
-                Prompt.name == PROMPT_TYPE_SYSTEM,
-                Prompt.is_active == True
-            ).first()
+    def _load_sync(self) -> None:
+        """Load active prompt into cache once, for callers running before startup"""
+        with self._lock:
+            if self._loaded.is_set():
+                return
 
-            if prompt:
-                self._cached_prompt = prompt.content
-                return prompt.content
-            return None
+            db = SessionLocal()
+            try:
+                content = db.execute(_ACTIVE_PROMPT_STMT).scalar_one_or_none()
 
-        except Exception as e:
-            logger.error(f"Failed to get active prompt: {e}")
-            return None
-        finally:
-            db.close()
+                if content:
+                    self._cache_prompt(content)
+
+            except Exception as e:
+                logger.error(f"Failed to get active prompt: {e}")
+            finally:
+                db.close()
 
     async def get_active_prompt(self, db: Session) -> Optional[Prompt]:
         """
@@ -172,7 +211,7 @@ class PromptService:
 
         # Reload into cache if this is the active system prompt
         if prompt.name == PROMPT_TYPE_SYSTEM and prompt.is_active:
-            self._cached_prompt = prompt.content
+            self._cache_prompt(prompt.content)
             logger.info(f"✅ Prompt updated (version {prompt.version})")
 
         return prompt
@@ -196,11 +235,30 @@ class PromptService:
         """
         variables = self.get_available_variables()
 
-        rendered = prompt_template
-        for var, value in variables.items():
-            rendered = rendered.replace(var, value)
+        # Fast path: active prompt only needs date/time substituted
+        if self._baked_prompt is not None and prompt_template == self._cached_prompt:
+            return _DYNAMIC_VAR_RE.sub(lambda match: variables[match.group(0)], self._baked_prompt)
+
+        return _VAR_RE.sub(lambda match: variables[match.group(0)], prompt_template)
+
+    def _cache_prompt(self, content: str) -> None:
+        """
+        Cache active prompt content and pre-render its static variables.
 
-        return rendered
+        Args:
+            content: Raw prompt template
+        """
+        baked = (
+            content
+            .replace("{restaurant_name}", self._restaurant_name)
+            .replace("{restaurant_phone}", self._restaurant_phone)
+            .replace("{restaurant_address}", self._restaurant_address)
+        )
+
+        with self._lock:
+            self._cached_prompt = content
+            self._baked_prompt = baked
+            self._loaded.set()
 
     def get_available_variables(self) -> Dict[str, str]:
         """
@@ -210,15 +268,34 @@ class PromptService:
             Dict of variable names to values
         """
         now = datetime.now()
+        key = now.toordinal() * 1440 + now.hour * 60 + now.minute
+
+        if self._time_cache is None or self._time_cache[0] != key:
+            self._time_cache = (key, now.strftime("%d.%m.%Y"), now.strftime("%H:%M"))
+        _, date_str, time_str = self._time_cache
 
         return {
-            "{date}": now.strftime("%d.%m.%Y"),
-            "{time}": now.strftime("%H:%M"),
-            "{restaurant_name}": settings.RESTAURANT_NAME,
-            "{restaurant_phone}": settings.RESTAURANT_PHONE,
-            "{restaurant_address}": settings.RESTAURANT_ADDRESS,
+            "{date}": date_str,
+            "{time}": time_str,
+            "{restaurant_name}": self._restaurant_name,
+            "{restaurant_phone}": self._restaurant_phone,
+            "{restaurant_address}": self._restaurant_address,
         }
 
+    def reload_settings(self) -> None:
+        """
+        Re-read restaurant settings and re-bake the cached prompt.
+        Call after changing RESTAURANT_* settings at runtime.
+        """
+        self._restaurant_name = settings.RESTAURANT_NAME
+        self._restaurant_phone = settings.RESTAURANT_PHONE
+        self._restaurant_address = settings.RESTAURANT_ADDRESS
+
+        with self._lock:
+            content = self._cached_prompt
+        if content is not None:
+            self._cache_prompt(content)
+
     async def reload_prompt(self, db: Session) -> Optional[str]:
         """
         🔥 Hot reload - reload prompt from database without restart.
@@ -3,13 +3,19 @@ RAG (Retrieval-Augmented Generation) service
 Combines vector search with LLM to provide contextual answers
 """
 
+import asyncio
+import itertools
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncGenerator, List, Dict, Any, Optional, Tuple
 
-from app.services.embeddings_service import embeddings_service
-from app.services.yandex_embeddings_service import yandex_embeddings_service
+import numpy as np
+import xxhash
+from cachetools import TTLCache
+
+from app.services.embeddings_provider import embeddings
 from app.services.vector_store_service import vector_store_service
 from app.services.llm_service import llm_service
+from app.services.semantic_cache import semantic_cache
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -18,14 +24,19 @@ logger = logging.getLogger(__name__)
 class RAGService:
     """Service for RAG-based question answering"""
 
+    # Constant parts of the context prompt wrapped around retrieved chunks
+    _CONTEXT_PREFIX = (
+        "Используй следующую информацию из базы знаний для ответа на вопрос клиента:\n\n"
+    )
+    _CONTEXT_SUFFIX = (
+        "\n\nЕсли информация не помогает ответить на вопрос, используй свои общие знания, "
+        "но упомяни что конкретной информации нет в базе."
+    )
+
     def __init__(self):
-        # Select embeddings provider based on config
-        if settings.EMBEDDINGS_PROVIDER == "yandex":
-            self.embeddings = yandex_embeddings_service
-            logger.info("✅ Using Yandex embeddings for RAG")
-        else:
-            self.embeddings = embeddings_service
-            logger.info("✅ Using OpenAI embeddings for RAG")
+        # Provider is resolved once at import (see embeddings_provider)
+        self.embeddings = embeddings
+        logger.info("✅ Using %s embeddings for RAG", settings.EMBEDDINGS_PROVIDER)
 
         self.vector_store = vector_store_service
         self.llm = llm_service
@@ -33,11 +44,24 @@ class RAGService:
         # RAG configuration
         self.top_k = 5  # Number of chunks to retrieve
         self.max_context_tokens = 2000  # Maximum tokens for context
+        # Chunks farther than this (cosine distance) are not sent to the LLM.
+        # Tuned per embedding model in settings; None disables the filter.
+        self.distance_threshold: Optional[float] = self._default_distance_threshold()
+
+        # Indexing: chunks are embedded in mini-batches, a few at a time
+        self.index_batch_size = 64
+        self.index_concurrency = 4
+
+        # Retrieval cache: repeated questions skip embedding + vector search.
+        # Cleared whenever the index changes.
+        self._context_cache: TTLCache = TTLCache(maxsize=512, ttl=300)
+        self._context_cache_lock = asyncio.Lock()
 
     async def retrieve_context(
         self,
         query: str,
-        top_k: Optional[int] = None
+        top_k: Optional[int] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve relevant context chunks for a query
@@ -45,24 +69,103 @@ class RAGService:
         Args:
             query: User query
             top_k: Number of chunks to retrieve (default: self.top_k)
+            query_embedding: Query embedding, if the caller already has it
 
         Returns:
             List of relevant chunks with content and metadata
         """
         k = top_k or self.top_k
+        cache_key = self._context_cache_key(query, k)
+
+        async with self._context_cache_lock:
+            cached = self._context_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Context cache hit for query: '%.50s...'", query)
+            return cached
 
         # Generate embedding for query
-        query_embedding = await self.embeddings.generate_embedding(query)
+        if query_embedding is None:
+            query_embedding = await self.embeddings.generate_embedding(query)
 
         # Search vector store
         results = await self.vector_store.search(
             query_embedding=query_embedding,
             top_k=k
         )
+        results = self._filter_by_distance(results)
+
+        async with self._context_cache_lock:
+            self._context_cache[cache_key] = results
 
-        logger.info(f"Retrieved {len(results)} context chunks for query: '{query[:50]}...'")
+        logger.info("Retrieved %d context chunks for query: '%.50s...'", len(results), query)
         return results
 
+    def _default_distance_threshold(self) -> Optional[float]:
+        """Distance threshold for the configured embedding provider"""
+        if self.vector_store.distance_space != "cosine":
+            # Legacy L2 collections may hold vectors indexed before they were
+            # normalized, so their distances have no fixed scale to cut at
+            logger.info(
+                "Distance filter disabled for '%s' collection",
+                self.vector_store.distance_space
+            )
+            return None
+
+        if settings.EMBEDDINGS_PROVIDER == "yandex":
+            return settings.RAG_MAX_DISTANCE_YANDEX
+        return settings.RAG_MAX_DISTANCE_OPENAI
+
+    def _filter_by_distance(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop chunks that are too far from the query to be useful context"""
+        threshold = self.distance_threshold
+        if threshold is None:
+            return results
+
+        relevant = [
+            r for r in results
+            if r["distance"] is not None and r["distance"] < threshold
+        ]
+
+        if len(relevant) < len(results):
+            logger.info("Dropped %d of %d chunks above distance threshold", len(results) - len(relevant), len(results))
+        return relevant
+
+    @staticmethod
+    def _context_cache_key(query: str, top_k: int) -> Tuple[int, int]:
+        """Cache key for a normalized query and result count"""
+        return xxhash.xxh3_128_intdigest(query.strip().lower().encode()), top_k
+
+    async def clear_context_cache(self) -> None:
+        """Drop cached retrieval results and answers (call after the index changes)"""
+        async with self._context_cache_lock:
+            self._context_cache.clear()
+        semantic_cache.clear()
+
+    async def prefetch_context(
+        self,
+        query: str,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> asyncio.Task:
+        """
+        Start context retrieval in the background
+
+        The task is stepped once so the embedding request is already in
+        flight while the caller does its own prep (history, prompt lookup).
+        Pass the task to answer_with_context* as context_task.
+
+        Args:
+            query: User query
+            query_embedding: Query embedding, if the caller already has it
+
+        Returns:
+            Task resolving to the retrieved chunks
+        """
+        task = asyncio.create_task(
+            self.retrieve_context(query, query_embedding=query_embedding)
+        )
+        await asyncio.sleep(0)
+        return task
+
     def build_context_prompt(self, chunks: List[Dict[str, Any]]) -> str:
         """
         Build context string from retrieved chunks
@@ -76,28 +179,20 @@ class RAGService:
         if not chunks:
             return ""
 
-        context_parts = []
-
-        for i, chunk in enumerate(chunks, 1):
-            content = chunk['content'].strip()
-            context_parts.append(f"[Документ {i}]\n{content}")
-
-        context = "\n\n".join(context_parts)
-
-        return f"""
-Используй следующую информацию из базы знаний для ответа на вопрос клиента:
-
-{context}
+        context = "\n\n".join(
+            f"[Документ {i}]\n{chunk['content'].strip()}"
+            for i, chunk in enumerate(chunks, 1)
+        )
 
-Если информация не помогает ответить на вопрос, используй свои общие знания, но упомяни что конкретной информации нет в базе.
-""".strip()
+        return self._CONTEXT_PREFIX + context + self._CONTEXT_SUFFIX
 
     async def answer_with_context(
         self,
         query: str,
         conversation_history: List[Dict[str, str]],
         system_prompt: str,
-        use_rag: bool = True
+        use_rag: bool = True,
+        context_task: Optional[asyncio.Task] = None
     ) -> Dict[str, Any]:
         """
         Generate answer using RAG
@@ -107,26 +202,14 @@ class RAGService:
             conversation_history: Previous messages
             system_prompt: System prompt for the bot
             use_rag: Whether to use RAG (default: True)
+            context_task: Retrieval already started via prefetch_context
 
         Returns:
             Dict with response and metadata
         """
-        context_chunks = []
-        rag_context = ""
-
-        if use_rag:
-            # Retrieve relevant context
-            context_chunks = await self.retrieve_context(query)
-
-            if context_chunks:
-                # Build context prompt
-                rag_context = self.build_context_prompt(context_chunks)
-
-        # Combine system prompt with RAG context
-        if rag_context:
-            enhanced_prompt = f"{system_prompt}\n\n{rag_context}"
-        else:
-            enhanced_prompt = system_prompt
+        context_chunks, enhanced_prompt = await self._prepare_prompt(
+            query, system_prompt, use_rag, context_task
+        )
 
         # Generate response using LLM
         llm_response = await self.llm.generate_response(
@@ -145,23 +228,93 @@ class RAGService:
         }
 
         logger.info(
-            f"Generated RAG answer: {len(context_chunks)} chunks used, "
-            f"response length: {len(result['content'])} chars"
+            "Generated RAG answer: %d chunks used, response length: %d chars",
+            len(context_chunks), len(result["content"])
         )
 
         return result
 
+    async def answer_with_context_streaming(
+        self,
+        query: str,
+        conversation_history: List[Dict[str, str]],
+        system_prompt: str,
+        use_rag: bool = True,
+        context_task: Optional[asyncio.Task] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream answer using RAG
+
+        Context is retrieved up front, then LLM output is yielded as it is
+        generated so callers can start speaking before the answer is complete.
+
+        Args:
+            query: User question
+            conversation_history: Previous messages
+            system_prompt: System prompt for the bot
+            use_rag: Whether to use RAG (default: True)
+            context_task: Retrieval already started via prefetch_context
+
+        Yields:
+            Response text deltas
+        """
+        context_chunks, enhanced_prompt = await self._prepare_prompt(
+            query, system_prompt, use_rag, context_task
+        )
+
+        logger.info("Streaming RAG answer: %d chunks used", len(context_chunks))
+
+        async for delta in self.llm.stream_response(
+            message=query,
+            conversation_history=conversation_history,
+            system_prompt=enhanced_prompt
+        ):
+            yield delta
+
+    async def _prepare_prompt(
+        self,
+        query: str,
+        system_prompt: str,
+        use_rag: bool,
+        context_task: Optional[asyncio.Task] = None
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Retrieve context and combine it with the system prompt
+
+        Returns:
+            Tuple of (context_chunks, enhanced_prompt)
+        """
+        context_chunks = []
+        rag_context = ""
+
+        if use_rag:
+            # Retrieve relevant context (or pick up the prefetched retrieval)
+            if context_task is not None:
+                context_chunks = await context_task
+            else:
+                context_chunks = await self.retrieve_context(query)
+
+            if context_chunks:
+                # Build context prompt
+                rag_context = self.build_context_prompt(context_chunks)
+
+        # Combine system prompt with RAG context
+        if rag_context:
+            enhanced_prompt = f"{system_prompt}\n\n{rag_context}"
+        else:
+            enhanced_prompt = system_prompt
+
+        return context_chunks, enhanced_prompt
+
     async def index_document_chunks(
         self,
-        chunks: List[Any],  # DocumentChunk objects
-        db: Any  # Session
+        chunks: List[Any]  # DocumentChunk objects
     ) -> None:
         """
         Index document chunks in vector store
 
         Args:
             chunks: List of DocumentChunk objects
-            db: Database session
         """
         if not chunks:
             logger.warning("No chunks to index")
@@ -170,18 +323,28 @@ class RAGService:
         # Extract text content from chunks
         texts = [chunk.content for chunk in chunks]
 
-        # Generate embeddings
-        logger.info(f"Generating embeddings for {len(texts)} chunks...")
-        embeddings = await self.embeddings.generate_embeddings_batch(texts)
+        # Generate embeddings in concurrent mini-batches (gather keeps order)
+        logger.info("Generating embeddings for %d chunks...", len(texts))
+        semaphore = asyncio.Semaphore(self.index_concurrency)
+
+        async def embed_batch(batch: List[str]):
+            async with semaphore:
+                return await self.embeddings.generate_embeddings_batch(batch)
+
+        batch_size = self.index_batch_size
+        results = await asyncio.gather(
+            *(embed_batch(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size))
+        )
+        embeddings = list(itertools.chain.from_iterable(results))
 
         # Add to vector store
         await self.vector_store.add_chunks(
             chunks=chunks,
-            embeddings=embeddings,
-            db=db
+            embeddings=embeddings
         )
+        await self.clear_context_cache()
 
-        logger.info(f"✅ Successfully indexed {len(chunks)} chunks")
+        logger.info("✅ Successfully indexed %d chunks", len(chunks))
 
     async def delete_document_from_index(self, document_id: str) -> None:
         """
@@ -191,7 +354,8 @@ class RAGService:
             document_id: Document ID to remove
         """
         await self.vector_store.delete_document_chunks(document_id)
-        logger.info(f"Deleted document {document_id} from index")
+        await self.clear_context_cache()
+        logger.info("Deleted document %s from index", document_id)
 
 
 # Create singleton instance
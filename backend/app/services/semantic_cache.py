@@ -0,0 +1,116 @@
+"""
+Semantic response cache
+Paraphrased repeats of a question ("Когда вы работаете?" / "До скольки вы
+открыты?") are answered from memory instead of another RAG + LLM round trip
+"""
+
+import logging
+import time
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _Namespace:
+    """Cached query vectors and responses for one prompt configuration"""
+
+    __slots__ = ("vectors", "responses", "expires")
+
+    def __init__(self, dim: int):
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.responses: List[str] = []
+        self.expires: List[float] = []
+
+
+class SemanticCache:
+    """
+    In-process nearest-neighbour cache of agent responses.
+
+    Queries are compared by cosine similarity of their (unit-length)
+    embeddings with a single matrix-vector product. Entries are grouped by
+    namespace (e.g. system prompt hash), so a prompt change never serves
+    answers generated under the old one. Not thread-safe: meant to be used
+    from the event loop only.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0, min_words: int = 3):
+        """
+        Args:
+            max_entries: Entries kept per namespace (oldest evicted first)
+            ttl: Seconds a cached response stays valid
+            min_words: Shorter inputs ("да", "нет") depend on the conversation
+                and are never cached
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.min_words = min_words
+        self._namespaces: Dict[Hashable, _Namespace] = {}
+
+    def is_cacheable(self, query: str) -> bool:
+        """Whether a query is self-contained enough to share answers"""
+        return len(query.split()) >= self.min_words
+
+    def lookup(
+        self,
+        namespace: Hashable,
+        embedding: np.ndarray,
+        threshold: float
+    ) -> Optional[str]:
+        """
+        Find the cached response for the most similar earlier query.
+
+        Args:
+            namespace: Cache namespace
+            embedding: Unit-length query embedding
+            threshold: Minimum cosine similarity for a hit
+
+        Returns:
+            Cached response text or None
+        """
+        entries = self._namespaces.get(namespace)
+        if entries is None or not entries.responses:
+            return None
+
+        scores = entries.vectors @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < threshold or entries.expires[best] < time.monotonic():
+            return None
+
+        logger.debug("Semantic cache hit (similarity %.3f)", scores[best])
+        return entries.responses[best]
+
+    def store(self, namespace: Hashable, embedding: np.ndarray, response: str) -> None:
+        """
+        Cache a response for a query embedding.
+
+        Args:
+            namespace: Cache namespace
+            embedding: Unit-length query embedding
+            response: Response text to return for similar queries
+        """
+        entries = self._namespaces.get(namespace)
+        if entries is None:
+            entries = self._namespaces[namespace] = _Namespace(embedding.shape[0])
+
+        # Drop expired entries, then the oldest ones over budget
+        now = time.monotonic()
+        keep = [i for i, expires in enumerate(entries.expires) if expires >= now]
+        keep = keep[-(self.max_entries - 1):] if self.max_entries > 1 else []
+        if len(keep) < len(entries.responses):
+            entries.vectors = entries.vectors[keep]
+            entries.responses = [entries.responses[i] for i in keep]
+            entries.expires = [entries.expires[i] for i in keep]
+
+        entries.vectors = np.vstack([entries.vectors, embedding.astype(np.float32, copy=False)])
+        entries.responses.append(response)
+        entries.expires.append(now + self.ttl)
+
+    def clear(self) -> None:
+        """Drop all cached responses (call when the knowledge base changes)"""
+        self._namespaces.clear()
+
+
+# Create singleton instance
+semantic_cache = SemanticCache()
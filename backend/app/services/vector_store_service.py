@@ -2,111 +2,153 @@
 Vector store service using ChromaDB for semantic search
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 import chromadb
 from chromadb.config import Settings
-import uuid
+import numpy as np
 
 from app.models import DocumentChunk
-from app.database import Session
 from app.config import settings as app_settings
 
 logger = logging.getLogger(__name__)
 
+# Shared stand-in for chunks without metadata (only ever unpacked, never mutated)
+_EMPTY_METADATA: Dict[str, Any] = {}
+
 
 class VectorStoreService:
-    """Service for managing vector embeddings in ChromaDB"""
+    """
+    Service for managing vector embeddings in ChromaDB
+
+    ChromaDB calls are synchronous, so they run in worker threads to keep
+    the event loop free while a query or write is in progress.
+    """
 
-    def __init__(self, persist_directory: str = "data/chroma"):
+    def __init__(
+        self,
+        persist_directory: str = "data/chroma",
+        search_ef: int = 40,
+        hnsw_m: int = 16,
+        construction_ef: int = 100,
+        sync_threshold: int = 10000
+    ):
         """
         Initialize ChromaDB client
 
         Args:
             persist_directory: Directory to persist ChromaDB data
+            search_ef: HNSW candidate list size at query time (recall vs latency).
+                Like hnsw_m and construction_ef, only applied when the
+                collection is created.
+            hnsw_m: HNSW graph degree
+            construction_ef: HNSW candidate list size at build time
+            sync_threshold: Vectors buffered before the HNSW index is flushed to disk
         """
-        self.client = chromadb.Client(Settings(
-            persist_directory=persist_directory,
-            anonymized_telemetry=False
-        ))
+        # Learned from stored vectors (provider-dependent), see get_collection_stats
+        self._embedding_dim: Optional[int] = None
+
+        self.client = chromadb.PersistentClient(
+            path=persist_directory,
+            settings=Settings(anonymized_telemetry=False)
+        )
 
         # Get or create collection (different name for different embedding providers)
         embeddings_provider = app_settings.EMBEDDINGS_PROVIDER
         self.collection_name = f"restaurant_knowledge_{embeddings_provider}"
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection_name,
-            metadata={
-                "description": "Restaurant knowledge base for RAG",
-                "embeddings_provider": embeddings_provider
-            }
-        )
+        try:
+            self.collection = self.client.get_collection(name=self.collection_name)
+            self._ensure_sync_threshold(sync_threshold)
+        except Exception:
+            # HNSW settings only apply at creation time. Embeddings are
+            # unit-length, so cosine ranks the same as the old L2 default.
+            self.collection = self.client.create_collection(
+                name=self.collection_name,
+                metadata={
+                    "description": "Restaurant knowledge base for RAG",
+                    "embeddings_provider": embeddings_provider,
+                    "hnsw:space": "cosine",
+                    "hnsw:M": hnsw_m,
+                    "hnsw:construction_ef": construction_ef,
+                    "hnsw:search_ef": search_ef,
+                    "hnsw:sync_threshold": sync_threshold
+                }
+            )
+
+        # Distance function of the collection ("l2" is ChromaDB's default)
+        self.distance_space = (self.collection.metadata or {}).get("hnsw:space", "l2")
 
         logger.info(f"✅ ChromaDB initialized with collection '{self.collection_name}' (embeddings: {embeddings_provider})")
 
+    def _ensure_sync_threshold(self, sync_threshold: int) -> None:
+        """
+        Add hnsw:sync_threshold to a collection created before it was set
+
+        modify() replaces the whole metadata dict, so only collections with
+        no HNSW settings of their own are touched.
+        """
+        metadata = dict(self.collection.metadata or {})
+        if any(key.startswith("hnsw:") for key in metadata):
+            return
+
+        metadata["hnsw:sync_threshold"] = sync_threshold
+        try:
+            self.collection.modify(metadata=metadata)
+        except Exception as e:
+            logger.warning(f"Could not set hnsw:sync_threshold on '{self.collection_name}': {e}")
+
     async def add_chunks(
         self,
         chunks: List[DocumentChunk],
-        embeddings: List[List[float]],
-        db: Session
+        embeddings: Union[List[List[float]], np.ndarray]
     ) -> None:
         """
-        Add document chunks with embeddings to vector store
+        Add document chunks with embeddings to vector store.
+        The chunk's own id is used as its ChromaDB id.
 
         Args:
             chunks: List of DocumentChunk objects
             embeddings: Corresponding embedding vectors
-            db: Database session
         """
         if len(chunks) != len(embeddings):
             raise ValueError("Number of chunks must match number of embeddings")
 
-        # Prepare data for ChromaDB
-        ids = []
-        documents = []
-        metadatas = []
-        embeddings_list = []
+        # One contiguous float32 buffer instead of lists of boxed floats
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(embeddings):
+            self._embedding_dim = embeddings.shape[1]
 
-        for chunk, embedding in zip(chunks, embeddings):
-            # Generate unique ID for ChromaDB
-            chromadb_id = str(uuid.uuid4())
+        # Prepare data for ChromaDB as parallel lists
+        ids = [str(chunk.id) for chunk in chunks]
+        documents = [chunk.content for chunk in chunks]
 
-            ids.append(chromadb_id)
-            documents.append(chunk.content)
-
-            # Metadata for filtering and retrieval
-            metadata = {
+        # Metadata for filtering and retrieval, plus any chunk-level metadata
+        metadatas = [
+            {
                 "chunk_id": str(chunk.id),
                 "document_id": str(chunk.document_id),
                 "chunk_index": chunk.chunk_index,
                 "token_count": chunk.token_count or 0,
+                **(chunk.meta_data or _EMPTY_METADATA),
             }
-
-            # Add any additional metadata from chunk
-            if chunk.meta_data:
-                metadata.update(chunk.meta_data)
-
-            metadatas.append(metadata)
-            embeddings_list.append(embedding)
-
-            # Save ChromaDB ID back to chunk
-            chunk.chromadb_id = chromadb_id
+            for chunk in chunks
+        ]
 
         # Add to ChromaDB
-        self.collection.add(
+        await asyncio.to_thread(
+            self.collection.add,
             ids=ids,
             documents=documents,
-            embeddings=embeddings_list,
+            embeddings=embeddings,
             metadatas=metadatas
         )
 
-        # Update chunks in database
-        db.commit()
-
         logger.info(f"✅ Added {len(chunks)} chunks to vector store")
 
     async def search(
         self,
-        query_embedding: List[float],
+        query_embedding: Union[List[float], np.ndarray],
         top_k: int = 5,
         filter_metadata: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
@@ -124,25 +166,30 @@ class VectorStoreService:
         # Build where clause for filtering
         where = filter_metadata if filter_metadata else None
 
+        query_embedding = np.asarray(query_embedding, dtype=np.float32)
+
         # Query ChromaDB
-        results = self.collection.query(
+        results = await asyncio.to_thread(
+            self.collection.query,
             query_embeddings=[query_embedding],
             n_results=top_k,
-            where=where
+            where=where,
+            include=["documents", "metadatas", "distances"]
         )
 
         # Format results
         search_results = []
 
         if results and results['ids'] and results['ids'][0]:
-            for i, doc_id in enumerate(results['ids'][0]):
-                result = {
-                    "id": doc_id,
-                    "content": results['documents'][0][i],
-                    "metadata": results['metadatas'][0][i],
-                    "distance": results['distances'][0][i] if 'distances' in results else None
-                }
-                search_results.append(result)
+            ids = results['ids'][0]
+            documents = results['documents'][0]
+            metadatas = results['metadatas'][0]
+            distances = results['distances'][0] if results.get('distances') else [None] * len(ids)
+
+            search_results = [
+                {"id": doc_id, "content": content, "metadata": metadata, "distance": distance}
+                for doc_id, content, metadata, distance in zip(ids, documents, metadatas, distances)
+            ]
 
         logger.info(f"Found {len(search_results)} results for query")
         return search_results
@@ -154,14 +201,17 @@ class VectorStoreService:
         Args:
             document_id: Document ID to delete
         """
-        # Find all chunks for this document
-        results = self.collection.get(
-            where={"document_id": document_id}
+        # Find all chunks for this document (ids only)
+        results = await asyncio.to_thread(
+            self.collection.get,
+            where={"document_id": document_id},
+            include=[]
         )
 
         if results and results['ids']:
             # Delete chunks
-            self.collection.delete(
+            await asyncio.to_thread(
+                self.collection.delete,
                 ids=results['ids']
             )
 
@@ -176,12 +226,19 @@ class VectorStoreService:
         Returns:
             Dict with collection stats
         """
-        count = self.collection.count()
+        count = await asyncio.to_thread(self.collection.count)
+
+        if self._embedding_dim is None and count:
+            # Read the dimension from a stored vector once
+            peeked = await asyncio.to_thread(self.collection.peek, limit=1)
+            stored = peeked.get("embeddings")
+            if stored is not None and len(stored):
+                self._embedding_dim = len(stored[0])
 
         return {
             "collection_name": self.collection_name,
             "total_chunks": count,
-            "embedding_dimension": 1536  # OpenAI text-embedding-3-small
+            "embedding_dimension": self._embedding_dim
         }
 
 
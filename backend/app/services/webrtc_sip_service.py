@@ -17,8 +17,8 @@ For production deployment, you would need:
 4. Media server for audio transcoding
 """
 
+import base64
 import logging
-import asyncio
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 import httpx
@@ -54,6 +54,14 @@ class WebRTCSIPService:
         self.twilio_auth_token = getattr(settings, 'TWILIO_AUTH_TOKEN', None)
         self.twilio_phone_number = getattr(settings, 'TWILIO_PHONE_NUMBER', None)
 
+        # Basic auth header for Twilio, encoded once
+        self._twilio_auth_header: Dict[str, str] = {}
+        if self.twilio_account_sid and self.twilio_auth_token:
+            token = base64.b64encode(
+                f"{self.twilio_account_sid}:{self.twilio_auth_token}".encode()
+            ).decode()
+            self._twilio_auth_header = {"Authorization": f"Basic {token}"}
+
         self.vonage_api_key = getattr(settings, 'VONAGE_API_KEY', None)
         self.vonage_api_secret = getattr(settings, 'VONAGE_API_SECRET', None)
 
@@ -62,9 +70,37 @@ class WebRTCSIPService:
         self.sip_username = getattr(settings, 'SIP_USERNAME', None)
         self.sip_password = getattr(settings, 'SIP_PASSWORD', None)
 
-        # Active calls tracking
+        # Webhook / media URLs
+        self.twiml_webhook_url = getattr(settings, 'TWIML_WEBHOOK_URL', None)
+        self.vonage_webhook_url = getattr(settings, 'VONAGE_WEBHOOK_URL', None)
+        self.webrtc_ws_url = getattr(settings, 'WEBRTC_WS_URL', 'wss://your-domain.com/api/vocode/ws')
+
+        # Shared HTTP client for provider APIs
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Active calls tracking. Only single-step operations (get, set,
+        # pop) are used, each atomic on its own, so no lock is needed.
         self.active_calls: Dict[str, Dict[str, Any]] = {}
 
+        # Inbound call flow is the same for every call - build it once
+        self._cached_twiml = self._build_twiml()
+        self._cached_ncco = tuple(self._build_ncco())
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client, created on first use inside the event loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def initiate_outbound_call(
         self,
         to_number: str,
@@ -117,7 +153,7 @@ class WebRTCSIPService:
 
         # TwiML for AI assistant
         # This would need to be a publicly accessible URL serving TwiML
-        twiml_url = getattr(settings, 'TWIML_WEBHOOK_URL', None)
+        twiml_url = self.twiml_webhook_url
 
         if not twiml_url:
             raise ValueError("TWIML_WEBHOOK_URL not configured")
@@ -131,28 +167,26 @@ class WebRTCSIPService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    data=data,
-                    auth=(self.twilio_account_sid, self.twilio_auth_token),
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                call_data = response.json()
-
-                # Track call
-                call_sid = call_data.get("sid")
-                self.active_calls[call_sid] = {
-                    "provider": "twilio",
-                    "to": to_number,
-                    "from": from_number,
-                    "status": call_data.get("status"),
-                    "created_at": call_data.get("date_created"),
-                }
-
-                logger.info(f"✅ Twilio call initiated: {call_sid} to {to_number}")
-                return call_data
+            response = await self._get_client().post(
+                url,
+                data=data,
+                headers=self._twilio_auth_header,
+            )
+            response.raise_for_status()
+            call_data = response.json()
+
+            # Track call
+            call_sid = call_data.get("sid")
+            self.active_calls[call_sid] = {
+                "provider": "twilio",
+                "to": to_number,
+                "from": from_number,
+                "status": call_data.get("status"),
+                "created_at": call_data.get("date_created"),
+            }
+
+            logger.info(f"✅ Twilio call initiated: {call_sid} to {to_number}")
+            return call_data
 
         except httpx.HTTPError as e:
             logger.error(f"Twilio API error: {e}")
@@ -176,7 +210,7 @@ class WebRTCSIPService:
 
         url = "https://api.nexmo.com/v1/calls"
 
-        webhook_url = getattr(settings, 'VONAGE_WEBHOOK_URL', None)
+        webhook_url = self.vonage_webhook_url
 
         data = {
             "to": [{"type": "phone", "number": to_number}],
@@ -186,18 +220,16 @@ class WebRTCSIPService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    json=data,
-                    auth=(self.vonage_api_key, self.vonage_api_secret),
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                call_data = response.json()
-
-                logger.info(f"✅ Vonage call initiated: {call_data.get('uuid')}")
-                return call_data
+            response = await self._get_client().post(
+                url,
+                json=data,
+                auth=(self.vonage_api_key, self.vonage_api_secret),
+            )
+            response.raise_for_status()
+            call_data = response.json()
+
+            logger.info(f"✅ Vonage call initiated: {call_data.get('uuid')}")
+            return call_data
 
         except httpx.HTTPError as e:
             logger.error(f"Vonage API error: {e}")
@@ -249,8 +281,16 @@ class WebRTCSIPService:
             raise ValueError(f"Unknown provider: {provider}")
 
     def _generate_twiml(self) -> str:
+        """Return TwiML for AI assistant (built once in __init__)"""
+        return self._cached_twiml
+
+    def _generate_ncco(self) -> list:
+        """Return NCCO for Vonage (built once in __init__)"""
+        return list(self._cached_ncco)
+
+    def _build_twiml(self) -> str:
         """
-        Generate TwiML for AI assistant
+        Build TwiML for AI assistant
 
         TwiML directs Twilio how to handle the call:
         - Connect to WebSocket for real-time audio
@@ -258,7 +298,7 @@ class WebRTCSIPService:
         - Gather DTMF input (phone keypad)
         """
         # WebSocket URL for real-time audio streaming
-        ws_url = getattr(settings, 'WEBRTC_WS_URL', 'wss://your-domain.com/api/vocode/ws')
+        ws_url = self.webrtc_ws_url
 
         twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
 <Response>
@@ -275,13 +315,13 @@ class WebRTCSIPService:
 
         return twiml
 
-    def _generate_ncco(self) -> list:
+    def _build_ncco(self) -> list:
         """
-        Generate NCCO (Nexmo Call Control Objects) for Vonage
+        Build NCCO (Nexmo Call Control Objects) for Vonage
 
         Similar to TwiML but in JSON format
         """
-        ws_url = getattr(settings, 'WEBRTC_WS_URL', 'wss://your-domain.com/api/vocode/ws')
+        ws_url = self.webrtc_ws_url
 
         ncco = [
             {
@@ -308,8 +348,9 @@ class WebRTCSIPService:
 
     async def get_call_status(self, call_sid: str, provider: str = "twilio") -> Dict[str, Any]:
         """Get current call status"""
-        if call_sid in self.active_calls:
-            return self.active_calls[call_sid]
+        call = self.active_calls.get(call_sid)
+        if call is not None:
+            return call
 
         if provider == "twilio":
             return await self._twilio_get_call_status(call_sid)
@@ -323,13 +364,12 @@ class WebRTCSIPService:
             f"{self.twilio_account_sid}/Calls/{call_sid}.json"
         )
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                auth=(self.twilio_account_sid, self.twilio_auth_token),
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._get_client().get(
+            url,
+            headers=self._twilio_auth_header,
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def end_call(self, call_sid: str, provider: str = "twilio") -> bool:
         """End active call"""
@@ -344,16 +384,14 @@ class WebRTCSIPService:
             f"{self.twilio_account_sid}/Calls/{call_sid}.json"
         )
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                data={"Status": "completed"},
-                auth=(self.twilio_account_sid, self.twilio_auth_token),
-            )
-            response.raise_for_status()
+        response = await self._get_client().post(
+            url,
+            data={"Status": "completed"},
+            headers=self._twilio_auth_header,
+        )
+        response.raise_for_status()
 
-        if call_sid in self.active_calls:
-            del self.active_calls[call_sid]
+        self.active_calls.pop(call_sid, None)
 
         logger.info(f"✅ Call ended: {call_sid}")
         return True
@@ -1,13 +1,20 @@
 """
 Yandex Embeddings service for generating vector representations of text
 Uses Yandex Foundation Models API
+
+Like the OpenAI service, embeddings are returned as L2-normalized float32
+numpy vectors.
 """
 
+import asyncio
 import logging
-from typing import List
+from typing import List, Optional
 import httpx
+import numpy as np
+import orjson
 
 from app.config import settings
+from app.services.http_retry import send_with_retry
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +28,36 @@ class YandexEmbeddingsService:
         self.url = "https://llm.api.cloud.yandex.net/foundationModels/v1/textEmbedding"
         self.model_uri = f"emb://{self.folder_id}/text-search-doc/latest"
         self.dimensions = 256  # Yandex text-search-doc has 256 dimensions
-
-    async def generate_embedding(self, text: str) -> List[float]:
+        self._headers = {
+            "Authorization": f"Api-Key {self.api_key}",
+            "Content-Type": "application/json",
+            "x-folder-id": self.folder_id
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Yandex has no batch endpoint: batches fan out into single requests,
+        # bounded per service so concurrent callers share the rate limit
+        self.max_concurrent_requests = 16
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client, created on first use inside the event loop"""
+        if self._client is None or self._client.is_closed:
+            # HTTP/2: concurrent embedding requests multiplex over one connection
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text
 
@@ -30,56 +65,64 @@ class YandexEmbeddingsService:
             text: Input text
 
         Returns:
-            List[float]: Embedding vector (256 dimensions)
+            np.ndarray: Unit-length float32 embedding vector (256 dimensions)
         """
         try:
-            headers = {
-                "Authorization": f"Api-Key {self.api_key}",
-                "Content-Type": "application/json",
-                "x-folder-id": self.folder_id
-            }
-
             data = {
                 "modelUri": self.model_uri,
                 "text": text
             }
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(self.url, headers=headers, json=data)
-                response.raise_for_status()
-                result = response.json()
+            # orjson: faster encode, and much faster decode of the float array
+            payload = orjson.dumps(data)
+            response = await send_with_retry(
+                lambda: self._get_client().post(self.url, headers=self._headers, content=payload)
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content)
 
-                # Extract embedding from response
-                embedding = result["embedding"]
-                logger.debug(f"Generated embedding for text: '{text[:50]}...'")
+            # Extract embedding from response
+            embedding = np.asarray(result["embedding"], dtype=np.float32)
+            embedding /= np.linalg.norm(embedding) + 1e-12
+            logger.debug(f"Generated embedding for text: '{text[:50]}...'")
 
-                return embedding
+            return embedding
 
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             raise
 
-    async def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts
 
-        Note: Yandex doesn't support batch API, so we process one by one
+        Note: Yandex doesn't support batch API, so texts are embedded with
+        concurrent single requests (at most max_concurrent_requests in flight)
 
         Args:
             texts: List of input texts
 
         Returns:
-            List[List[float]]: List of embedding vectors
+            np.ndarray: (len(texts), dimensions) matrix of unit-length float32 rows
         """
+        if not texts:
+            return np.empty((0, self.dimensions), dtype=np.float32)
+
         try:
-            all_embeddings = []
+            done = 0
 
-            for i, text in enumerate(texts):
-                embedding = await self.generate_embedding(text)
-                all_embeddings.append(embedding)
+            async def embed_one(text: str) -> np.ndarray:
+                nonlocal done
+                async with self._semaphore:
+                    embedding = await self.generate_embedding(text)
+
+                done += 1
+                if done % 10 == 0:
+                    logger.info(f"Generated {done}/{len(texts)} embeddings")
+                return embedding
 
-                if (i + 1) % 10 == 0:
-                    logger.info(f"Generated {i + 1}/{len(texts)} embeddings")
+            # gather preserves input order
+            all_embeddings = np.stack(await asyncio.gather(*(embed_one(text) for text in texts)))
 
             logger.info(f"✅ Generated {len(all_embeddings)} Yandex embeddings total")
             return all_embeddings
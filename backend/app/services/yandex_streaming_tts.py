@@ -5,13 +5,30 @@ Uses gRPC API for low-latency streaming synthesis
 
 import logging
 import asyncio
-from typing import AsyncGenerator, Optional
+import re
+from typing import AsyncGenerator, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import httpx
 
 from app.config import settings
+from app.services.audio_cache import AudioCache
+from app.services.http_retry import send_with_retry
 
 logger = logging.getLogger(__name__)
 
+# Sentence endings (Russian and English); the group keeps punctuation in split()
+_SENT_SPLIT_RE = re.compile(r'([.!?]+\s+)')
+
+# Sentence requests in flight per synthesize_streaming call; keeps long answers
+# from bursting past the SpeechKit request quota
+MAX_PARALLEL_SENTENCES = 4
+
+
+def iter_chunks(audio: bytes, chunk_size: int) -> Iterator[memoryview]:
+    """Zero-copy chunking of a complete audio buffer"""
+    view = memoryview(audio)
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
+
 
 class YandexStreamingTTSService:
     """
@@ -31,20 +48,46 @@ class YandexStreamingTTSService:
         self.api_key = settings.YANDEX_API_KEY
         self.folder_id = settings.YANDEX_FOLDER_ID
         self.tts_url = "https://tts.api.cloud.yandex.net/speech/v1/tts:synthesize"
+        self._headers = {"Authorization": f"Api-Key {self.api_key}"}
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Synthesized sentences, keyed by text + voice parameters
+        self._audio_cache = AudioCache(max_bytes=64 * 1024 * 1024)
+        # Requests on the wire, by the same key: concurrent calls asking for
+        # the same sentence (greetings, closers) share one synthesis
+        self._inflight: Dict[int, asyncio.Future] = {}
+        # Form fields per voice config (voice, language, speed, emotion)
+        self._voice_fields: Dict[tuple, Dict[str, str]] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client, created on first use inside the event loop"""
+        if self._client is None or self._client.is_closed:
+            # HTTP/2: concurrent sentence requests multiplex over one connection
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _split_into_sentences(self, text: str, max_length: int = 200) -> list[str]:
         """
         Split text into sentences for streaming synthesis
         Handles both Russian and English sentence endings
         """
-        import re
-
         # Split by sentence endings
-        sentences = re.split(r'([.!?]+\s+)', text)
+        sentences = _SENT_SPLIT_RE.split(text)
 
         # Rejoin punctuation with sentences
         result = []
-        current = ""
+        current = []  # Pieces of the sentence being built, joined once
+        current_length = 0
 
         for i in range(0, len(sentences), 2):
             sentence = sentences[i]
@@ -53,14 +96,17 @@ class YandexStreamingTTSService:
             chunk = sentence + punct
 
             # If adding this would exceed max_length, yield current and start new
-            if len(current) + len(chunk) > max_length and current:
-                result.append(current.strip())
-                current = chunk
+            if current_length + len(chunk) > max_length and current:
+                result.append("".join(current).strip())
+                current = [chunk]
+                current_length = len(chunk)
             else:
-                current += chunk
+                current.append(chunk)
+                current_length += len(chunk)
 
-        if current.strip():
-            result.append(current.strip())
+        last = "".join(current).strip()
+        if last:
+            result.append(last)
 
         return result if result else [text]
 
@@ -72,7 +118,8 @@ class YandexStreamingTTSService:
         speed: float = 1.0,
         emotion: str = "neutral",
         chunk_size: int = 4096,
-    ) -> AsyncGenerator[bytes, None]:
+        marks: Optional[List[Tuple[int, int]]] = None,
+    ) -> AsyncGenerator[Union[bytes, memoryview], None]:
         """
         Synthesize speech with streaming delivery
 
@@ -86,9 +133,12 @@ class YandexStreamingTTSService:
             speed: Speech speed (0.1 to 3.0)
             emotion: Voice emotion
             chunk_size: Size of audio chunks to yield
+            marks: If given, an (audio bytes, text chars) pair is appended at
+                the end of each sentence, mapping playback position to text
 
         Yields:
-            Audio chunks (PCM 16-bit, 16kHz, mono)
+            Audio chunks (PCM 16-bit, 16kHz, mono) - bytes, or memoryview
+            slices of a buffered sentence (both work with send_bytes)
         """
         if not self.api_key or not self.folder_id:
             logger.error("Yandex API credentials not configured")
@@ -96,99 +146,292 @@ class YandexStreamingTTSService:
 
         # Split text into sentences for streaming
         sentences = self._split_into_sentences(text)
-        logger.info(f"Streaming TTS for {len(sentences)} sentence chunks")
-
-        # Synthesize sentences concurrently (but yield in order)
-        tasks = []
-        for sentence in sentences:
-            task = self._synthesize_sentence(
-                sentence, voice, language, speed, emotion
+        logger.info("Streaming TTS for %d sentence chunks", len(sentences))
+
+        # Every sentence streams concurrently into its own queue; queues are
+        # drained in text order. The current sentence plays as its bytes
+        # arrive, and later sentences are already buffered (or still
+        # arriving) by the time playback reaches them. Tasks take semaphore
+        # slots in creation (= text) order, so the first sentences go first.
+        limit = asyncio.Semaphore(MAX_PARALLEL_SENTENCES)
+        queues = [asyncio.Queue() for _ in sentences]
+        tasks = [
+            asyncio.create_task(
+                self._pump_sentence(
+                    limit, queue, sentence, voice, language, speed, emotion, chunk_size
+                )
             )
-            tasks.append(task)
-
-        # Yield audio as soon as each sentence is ready
-        for i, task in enumerate(tasks):
-            try:
-                audio_data = await task
-
-                if audio_data:
-                    # Yield in chunks for smooth playback
-                    for offset in range(0, len(audio_data), chunk_size):
-                        chunk = audio_data[offset:offset + chunk_size]
-                        yield chunk
+            for queue, sentence in zip(queues, sentences)
+        ]
 
+        yielded = 0
+        text_pos = 0
+        try:
+            for i, queue in enumerate(queues):
+                total_bytes = 0
+                while (chunk := await queue.get()) is not None:
+                    total_bytes += len(chunk)
+                    yield chunk
+
+                yielded += total_bytes
+                if marks is not None:
+                    # Sentences are stripped slices of text, in order
+                    start = text.find(sentences[i], text_pos)
+                    if start >= 0:
+                        text_pos = start + len(sentences[i])
+                    marks.append((yielded, text_pos))
+
+                if total_bytes:
                     logger.debug(
-                        f"Yielded sentence {i+1}/{len(sentences)}: "
-                        f"{len(audio_data)} bytes"
+                        "Yielded sentence %d/%d: %d bytes",
+                        i + 1, len(sentences), total_bytes
                     )
                 else:
-                    logger.warning(f"No audio for sentence {i+1}")
-
-            except Exception as e:
-                logger.error(f"Error synthesizing sentence {i+1}: {e}")
-                continue
-
-    async def _synthesize_sentence(
+                    logger.warning("No audio for sentence %d", i + 1)
+        finally:
+            # Consumer stopped early (e.g. barge-in): drop requests still in flight
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _request_data(
         self,
         text: str,
         voice: str,
         language: str,
         speed: float,
         emotion: str,
-    ) -> Optional[bytes]:
-        """Synthesize a single sentence (REST API call)"""
-        try:
-            headers = {
-                "Authorization": f"Api-Key {self.api_key}",
-            }
-
-            data = {
-                "text": text,
+    ) -> Dict[str, str]:
+        """Form fields for a synthesis request"""
+        voice_fields = self._voice_fields.get((voice, language, speed, emotion))
+        if voice_fields is None:
+            # Calls use a handful of voice configs: build each one's fields once
+            voice_fields = self._voice_fields[(voice, language, speed, emotion)] = {
                 "lang": language,
                 "voice": voice,
                 "speed": str(speed),
                 "format": "lpcm",
                 "sampleRateHertz": "16000",
                 "emotion": emotion,
-                "folderId": self.folder_id,
             }
+            # API-key auth needs no folder: send folderId only when one is set
+            if self.folder_id:
+                voice_fields["folderId"] = self.folder_id
+        return {**voice_fields, "text": text}
+
+    async def _await_inflight(self, cache_key: int) -> Optional[bytes]:
+        """
+        Audio from an identical request already in flight, or None if there
+        is none or it failed / was abandoned (the caller then requests itself)
+        """
+        future = self._inflight.get(cache_key)
+        if future is None:
+            return None
+        # Shielded: a waiter's cancellation must not cancel the shared result
+        return await asyncio.shield(future)
+
+    def _begin_inflight(self, cache_key: int) -> asyncio.Future:
+        """Register this request as the one others wait on"""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        return future
+
+    def _end_inflight(self, cache_key: int, future: asyncio.Future, audio: Optional[bytes]) -> None:
+        """Hand the result (None on failure) to waiters and unregister"""
+        if self._inflight.get(cache_key) is future:
+            del self._inflight[cache_key]
+        future.set_result(audio)
+
+    async def _stream_sentence(
+        self,
+        text: str,
+        voice: str,
+        language: str,
+        speed: float,
+        emotion: str,
+        chunk_size: int,
+    ) -> AsyncGenerator[Union[bytes, memoryview], None]:
+        """Synthesize a single sentence, yielding audio while the response arrives"""
+        cache_key = AudioCache.make_key(text, voice, language, speed, emotion)
+        cached = self._audio_cache.get(cache_key)
+        if cached is None:
+            cached = await self._await_inflight(cache_key)
+        if cached is not None:
+            for chunk in iter_chunks(cached, chunk_size):
+                yield chunk
+            return
+
+        data = self._request_data(text, voice, language, speed, emotion)
+        parts = []
+        audio = None
+        inflight = self._begin_inflight(cache_key)
+
+        try:
+            client = self._get_client()
+            request = client.build_request("POST", self.tts_url, headers=self._headers, data=data)
+
+            # Retries happen on the status line, before any audio is yielded
+            response = await send_with_retry(lambda: client.send(request, stream=True))
+            try:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(chunk_size):
+                    parts.append(chunk)
+                    yield chunk
+            finally:
+                await response.aclose()
+
+            # Only complete responses are cached
+            audio = b"".join(parts)
+            self._audio_cache.put(cache_key, audio)
+
+        except httpx.HTTPError as e:
+            logger.error("Yandex TTS API error: %s", e)
+        except Exception as e:
+            logger.error("Error calling Yandex TTS: %s", e)
+        finally:
+            # Also runs when the stream is closed early (barge-in)
+            self._end_inflight(cache_key, inflight, audio)
+
+    async def _pump_sentence(
+        self,
+        limit: asyncio.Semaphore,
+        queue: asyncio.Queue,
+        text: str,
+        voice: str,
+        language: str,
+        speed: float,
+        emotion: str,
+        chunk_size: int,
+    ) -> None:
+        """Stream one sentence's audio into a queue, then put None as end marker"""
+        try:
+            async with limit:
+                async for chunk in self._stream_sentence(
+                    text, voice, language, speed, emotion, chunk_size
+                ):
+                    queue.put_nowait(chunk)
+        finally:
+            queue.put_nowait(None)
+
+    async def stream_sentence(
+        self,
+        text: str,
+        voice: str,
+        language: str,
+        speed: float,
+        emotion: str,
+        chunk_size: int,
+        limit: asyncio.Semaphore,
+    ) -> AsyncGenerator[Union[bytes, memoryview], None]:
+        """
+        Synthesize text in one request, yielding audio as it arrives (cached)
+
+        The response is read in the background while holding a slot of
+        limit, so a consumer paced by playback doesn't keep the slot taken.
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
+        Yields:
+            Audio chunks (PCM 16-bit, 16kHz, mono)
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(
+            self._pump_sentence(limit, queue, text, voice, language, speed, emotion, chunk_size)
+        )
+        try:
+            while (chunk := await queue.get()) is not None:
+                yield chunk
+        finally:
+            # Consumer stopped early (e.g. barge-in): drop the request
+            if not task.done():
+                task.cancel()
+
+    async def synthesize_sentence(
+        self,
+        text: str,
+        voice: str,
+        language: str,
+        speed: float,
+        emotion: str,
+    ) -> Optional[bytes]:
+        """
+        Synthesize a single sentence in one REST call (cached). A request
+        for the same sentence already in flight is awaited instead of repeated.
+
+        Returns:
+            Complete PCM audio (16-bit, 16kHz, mono) or None on failure
+        """
+        cache_key = AudioCache.make_key(text, voice, language, speed, emotion)
+        cached = self._audio_cache.get(cache_key)
+        if cached is None:
+            cached = await self._await_inflight(cache_key)
+        if cached is not None:
+            return cached
+
+        audio = None
+        inflight = self._begin_inflight(cache_key)
+        try:
+            data = self._request_data(text, voice, language, speed, emotion)
+            response = await send_with_retry(
+                lambda: self._get_client().post(
                     self.tts_url,
-                    headers=headers,
+                    headers=self._headers,
                     data=data,
                 )
-                response.raise_for_status()
-                return response.content
+            )
+            response.raise_for_status()
+            audio = response.content
+            self._audio_cache.put(cache_key, audio)
+            return audio
 
         except httpx.HTTPError as e:
-            logger.error(f"Yandex TTS API error: {e}")
+            logger.error("Yandex TTS API error: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Error calling Yandex TTS: {e}")
+            logger.error("Error calling Yandex TTS: %s", e)
             return None
+        finally:
+            self._end_inflight(cache_key, inflight, audio)
+
+    async def warm_up(
+        self,
+        texts: Iterable[str],
+        voice: str = "alena",
+        language: str = "ru-RU",
+        speed: float = 1.0,
+        emotion: str = "neutral",
+    ) -> None:
+        """
+        Pre-synthesize fixed phrases (e.g. the greeting) into the audio cache
+
+        Args:
+            texts: Phrases to synthesize
+            voice, language, speed, emotion: Must match the synthesizer config
+                for the cached audio to be hit later
+        """
+        if not self.api_key or not self.folder_id:
+            return
+
+        for text in texts:
+            audio = await self.synthesize_sentence(text, voice, language, speed, emotion)
+            if audio:
+                logger.info("🔥 TTS cache warmed: %d bytes for '%.50s'", len(audio), text)
 
     async def synthesize_fast(
         self,
         text: str,
         voice: str = "alena",
         speed: float = 1.0,
-    ) -> AsyncGenerator[bytes, None]:
+    ) -> AsyncGenerator[Union[bytes, memoryview], None]:
         """
         Fast synthesis mode - optimized for low latency
         Uses aggressive sentence splitting and smaller chunks
         """
         # For short text, just synthesize directly
         if len(text) < 100:
-            audio = await self._synthesize_sentence(
-                text, voice, "ru-RU", speed, "neutral"
-            )
-            if audio:
-                # Yield in small chunks for immediate playback
-                chunk_size = 2048
-                for offset in range(0, len(audio), chunk_size):
-                    yield audio[offset:offset + chunk_size]
+            # Small chunks, forwarded as they arrive, for immediate playback
+            async for chunk in self._stream_sentence(
+                text, voice, "ru-RU", speed, "neutral", chunk_size=2048
+            ):
+                yield chunk
             return
 
         # For longer text, use streaming
@@ -3,15 +3,21 @@ Yandex SpeechKit STT (Speech-to-Text) service
 Converts audio to text using Yandex Cloud Speech Recognition API
 """
 
+import asyncio
 import httpx
 import logging
+import orjson
 import io
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from pydub import AudioSegment
 from app.config import settings
+from app.services.http_retry import send_with_retry
 
 logger = logging.getLogger(__name__)
 
+# Ogg container magic; Ogg/Opus is accepted by Yandex STT as-is ("oggopus")
+OGG_MAGIC = b"OggS"
+
 
 class YandexSTTService:
     """Service for converting speech to text using Yandex SpeechKit"""
@@ -20,17 +26,34 @@ class YandexSTTService:
         self.api_key = settings.YANDEX_API_KEY
         self.folder_id = settings.YANDEX_FOLDER_ID
         self.stt_url = "https://stt.api.cloud.yandex.net/speech/v1/stt:recognize"
-
-    def _convert_to_wav(self, audio_data: bytes, source_format: str = "webm") -> bytes:
+        self._headers = {"Authorization": f"Api-Key {self.api_key}"}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client, created on first use inside the event loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _convert_to_pcm(self, audio_data: bytes, source_format: str = "webm") -> bytes:
         """
-        Convert audio to WAV PCM format for Yandex STT.
+        Convert audio to raw PCM for Yandex STT ("lpcm" is headerless).
 
         Args:
             audio_data: Input audio bytes
             source_format: Source format (webm, ogg, mp3, etc.)
 
         Returns:
-            WAV audio bytes (16kHz, mono, 16-bit PCM)
+            Raw PCM bytes (16kHz, mono, 16-bit)
         """
         try:
             # Load audio from bytes
@@ -44,18 +67,44 @@ class YandexSTTService:
             audio = audio.set_channels(1)
             audio = audio.set_sample_width(2)  # 16-bit = 2 bytes
 
-            # Export as WAV
-            wav_buffer = io.BytesIO()
-            audio.export(wav_buffer, format="wav")
-            wav_bytes = wav_buffer.getvalue()
+            # Samples are already s16 mono 16kHz - no second ffmpeg export pass
+            pcm_bytes = audio.raw_data
 
-            logger.debug(f"Converted {len(audio_data)} bytes of {source_format} to {len(wav_bytes)} bytes of WAV")
-            return wav_bytes
+            logger.debug(f"Converted {len(audio_data)} bytes of {source_format} to {len(pcm_bytes)} bytes of PCM")
+            return pcm_bytes
 
         except Exception as e:
             logger.error(f"Failed to convert audio: {e}")
             raise
 
+    async def _prepare_audio(self, audio_data: bytes, source_format: str) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Pick the request body and Yandex format params for the input audio.
+        Only audio Yandex can't decode goes through pydub/ffmpeg.
+
+        Args:
+            audio_data: Input audio bytes
+            source_format: Format declared by the caller
+
+        Returns:
+            Tuple of (body, format params)
+        """
+        if audio_data[:4] == OGG_MAGIC:
+            # Yandex decodes Ogg/Opus natively (detected by content, since
+            # browsers don't always label it consistently)
+            return audio_data, {"format": "oggopus"}
+
+        if source_format == "lpcm":
+            # Already raw 16kHz mono PCM
+            return audio_data, {"format": "lpcm", "sampleRateHertz": "16000"}
+
+        # Anything else (webm, mp3, ...) is converted. Decoding is blocking
+        # (ffmpeg subprocess), so it runs in a worker thread.
+        pcm_data = await asyncio.to_thread(
+            self._convert_to_pcm, audio_data, source_format=source_format
+        )
+        return pcm_data, {"format": "lpcm", "sampleRateHertz": "16000"}
+
     async def recognize_audio(
         self,
         audio_data: bytes,
@@ -74,7 +123,8 @@ class YandexSTTService:
             Recognized text or None if recognition failed
 
         Note:
-        - Automatically converts audio to WAV PCM 16kHz mono for Yandex STT
+        - Ogg/Opus (detected by content) and raw lpcm are sent unchanged
+        - Anything else is converted to raw PCM 16kHz mono for Yandex STT
         - Max 1MB per request
         - Max 30 seconds audio duration
         """
@@ -83,34 +133,28 @@ class YandexSTTService:
             return None
 
         try:
-            # Convert audio to WAV format for Yandex
-            wav_data = self._convert_to_wav(audio_data, source_format=format)
-
-            headers = {
-                "Authorization": f"Api-Key {self.api_key}",
-            }
-
+            body, format_params = await self._prepare_audio(audio_data, format)
             params = {
                 "lang": language,
-                "format": "lpcm",  # We're sending PCM WAV
-                "sampleRateHertz": "16000",
                 "folderId": self.folder_id,
+                **format_params,
             }
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
+            response = await send_with_retry(
+                lambda: self._get_client().post(
                     self.stt_url,
-                    headers=headers,
+                    headers=self._headers,
                     params=params,
-                    content=wav_data
+                    content=body
                 )
-                response.raise_for_status()
-                result = response.json()
-
-                # Extract recognized text
-                text = result.get("result", "")
-                logger.info(f"✅ STT recognized: '{text}'")
-                return text
+            )
+            response.raise_for_status()
+            result = orjson.loads(response.content)
+
+            # Extract recognized text
+            text = result.get("result", "")
+            logger.info(f"✅ STT recognized: '{text}'")
+            return text
 
         except httpx.TimeoutException:
             logger.error("STT request timeout")
@@ -7,6 +7,7 @@ import httpx
 import logging
 from typing import Optional
 from app.config import settings
+from app.services.audio_cache import AudioCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,27 @@ class YandexTTSService:
         self.api_key = settings.YANDEX_API_KEY
         self.folder_id = settings.YANDEX_FOLDER_ID
         self.tts_url = "https://tts.api.cloud.yandex.net/speech/v1/tts:synthesize"
+        self._headers = {"Authorization": f"Api-Key {self.api_key}"}
+
+        # Synthesized audio keyed by text + voice parameters + format
+        self._audio_cache = AudioCache(max_bytes=32 * 1024 * 1024)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client, created on first use inside the event loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def synthesize_speech(
         self,
@@ -59,10 +81,13 @@ class YandexTTSService:
             logger.error("Yandex API credentials not configured")
             return None
 
-        headers = {
-            "Authorization": f"Api-Key {self.api_key}",
-        }
+        cache_key = AudioCache.make_key(text, language, voice, emotion, speed, format)
+        cached = self._audio_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"✅ TTS cache hit: {len(cached)} bytes for text: '{text[:50]}...'")
+            return cached
 
+        # TTS v1 only accepts form-encoded parameters, not JSON
         data = {
             "text": text,
             "lang": language,
@@ -74,29 +99,29 @@ class YandexTTSService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.tts_url,
-                    headers=headers,
-                    data=data
-                )
-                response.raise_for_status()
-
-                # Response is audio bytes
-                audio_data = response.content
-                logger.info(f"✅ TTS synthesized {len(audio_data)} bytes for text: '{text[:50]}...'")
-                return audio_data
+            response = await self._get_client().post(
+                self.tts_url,
+                headers=self._headers,
+                data=data
+            )
+            if response.status_code != 200:
+                logger.error(f"Yandex TTS API error {response.status_code}: {response.text}")
+                return None
+
+            # Response is audio bytes
+            audio_data = response.content
+            self._audio_cache.put(cache_key, audio_data)
+            logger.info(f"✅ TTS synthesized {len(audio_data)} bytes for text: '{text[:50]}...'")
+            return audio_data
 
         except httpx.TimeoutException:
             logger.error("TTS request timeout")
             return None
-        except httpx.HTTPError as e:
-            logger.error(f"Yandex TTS API error: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response body: {e.response.text}")
+        except httpx.RequestError as e:
+            logger.error(f"TTS request failed: {e}")
             return None
         except Exception as e:
-            logger.error(f"Unexpected error in TTS: {e}")
+            logger.error(f"Unexpected error in TTS: {e}", exc_info=True)
             return None
 
 
@@ -3,29 +3,57 @@ Hostess Agent for Vocode with RAG integration
 """
 
 import asyncio
+import functools
 import logging
+import re
 from typing import Optional, AsyncGenerator
 import uuid
 
+import numpy as np
+import xxhash
+from sqlalchemy import select
 from vocode.streaming.agent.base_agent import BaseAgent, AgentResponseMessage
 from vocode.streaming.models.agent import AgentConfig
 from vocode.streaming.models.message import BaseMessage
 
 from app.services.rag_service import rag_service
 from app.services.prompt_service import prompt_service
-from app.database import get_db
+from app.services.semantic_cache import semantic_cache
+from app.services.message_writer import message_writer
+from app.database import SessionLocal
 from app.models.conversation import Conversation
 from app.models.message import Message
-from app.core.constants import MESSAGE_ROLE_USER, MESSAGE_ROLE_ASSISTANT
+from app.core.constants import GREETING_MESSAGE
 
 logger = logging.getLogger(__name__)
 
+# End of a sentence in streamed LLM output: punctuation followed by whitespace
+SENTENCE_END_RE = re.compile(r"[.!?]+\s")
+
+# Shorter sentences ("Да.", "Конечно!") are merged into the next one, so each
+# TTS request carries enough text to be worth the round trip
+MIN_SENTENCE_CHARS = 15
+
+# Phrases that end the call, matched in one case-insensitive scan
+END_PHRASES = ("до свидания", "всего доброго", "спасибо за звонок")
+END_PHRASES_RE = re.compile("|".join(map(re.escape, END_PHRASES)), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_uuid(value: str) -> uuid.UUID:
+    """Parse a call id into a UUID (cached - reconnects reuse the same id)"""
+    return uuid.UUID(value)
+
 
 class HostessAgentConfig(AgentConfig):
     """Configuration for Hostess Agent"""
 
     use_rag: bool = True
-    initial_message: Optional[str] = "Добрый день! Ресторан Гастрономия, чем могу помочь?"
+    initial_message: Optional[str] = GREETING_MESSAGE
+    language_code: str = "ru-RU"
+    # Cosine similarity above which a paraphrased opening question reuses an
+    # earlier answer (skipping RAG + LLM); None disables the semantic cache
+    semantic_cache_threshold: Optional[float] = 0.92
 
 
 class HostessAgent(BaseAgent[HostessAgentConfig]):
@@ -33,13 +61,20 @@ class HostessAgent(BaseAgent[HostessAgentConfig]):
     AI Hostess Agent with RAG capabilities for Vocode
     """
 
+    # Per-session state read on every turn gets slot storage. BaseAgent
+    # itself is not slotted, so instances still carry a __dict__.
+    __slots__ = ("conversation_history", "conversation_id", "_history_loaded")
+
     def __init__(self, agent_config: HostessAgentConfig):
         super().__init__(agent_config=agent_config)
 
+        # In-memory history is authoritative once loaded: turns are appended
+        # here and written through to the DB, never re-read
         self.conversation_history = []
         self.conversation_id = None
+        self._history_loaded = False
 
-        logger.info(f"HostessAgent initialized with RAG={'enabled' if agent_config.use_rag else 'disabled'}")
+        logger.info("HostessAgent initialized with RAG=%s", 'enabled' if agent_config.use_rag else 'disabled')
 
     async def respond(
         self,
@@ -54,20 +89,12 @@ class HostessAgent(BaseAgent[HostessAgentConfig]):
             Tuple of (response_text, end_conversation)
         """
         try:
-            # Initialize conversation if needed
-            if not self.conversation_id:
-                self.conversation_id = uuid.UUID(conversation_id)
-                await self._load_conversation_history()
-
-            # Get system prompt from DB
-            system_prompt = None
-            db_gen = get_db()
-            db = next(db_gen)
-            try:
-                prompt_obj = await prompt_service.get_active_prompt(db)
-                system_prompt = prompt_obj.content if prompt_obj else None
-            finally:
-                db.close()
+            system_prompt, query_embedding, cache_namespace, cached, context_task = (
+                await self._begin_turn(human_input, conversation_id)
+            )
+            if cached is not None:
+                await self._finish_turn(human_input, cached)
+                return cached, self.should_end_conversation(cached)
 
             # Generate response using RAG
             if self.agent_config.use_rag:
@@ -75,7 +102,8 @@ class HostessAgent(BaseAgent[HostessAgentConfig]):
                     query=human_input,
                     conversation_history=self.conversation_history,
                     system_prompt=system_prompt,
-                    use_rag=True
+                    use_rag=True,
+                    context_task=context_task
                 )
                 response_text = rag_response["content"]
             else:
@@ -88,22 +116,20 @@ class HostessAgent(BaseAgent[HostessAgentConfig]):
                 )
                 response_text = llm_response["content"]
 
-            # Save to history
-            self.conversation_history.append({"role": "user", "content": human_input})
-            self.conversation_history.append({"role": "assistant", "content": response_text})
+            if cache_namespace is not None and response_text:
+                semantic_cache.store(cache_namespace, query_embedding, response_text)
 
-            # Save to DB
-            await self._save_messages(human_input, response_text)
+            await self._finish_turn(human_input, response_text)
 
-            logger.info(f"Response: {response_text[:100]}...")
+            logger.info("Response: %.100s...", response_text)
 
             # Check if we should end conversation
-            end_conversation = self._should_end_conversation(response_text)
+            end_conversation = self.should_end_conversation(response_text)
 
             return response_text, end_conversation
 
         except Exception as e:
-            logger.error(f"Error generating response: {e}", exc_info=True)
+            logger.error("Error generating response: %s", e, exc_info=True)
             return "Извините, произошла ошибка. Попробуйте повторить вопрос.", False
 
     async def generate_response(
@@ -114,86 +140,242 @@ class HostessAgent(BaseAgent[HostessAgentConfig]):
     ) -> AsyncGenerator[AgentResponseMessage, None]:
         """
         Generate response as async generator (for streaming)
-        """
-        response_text, end_conversation = await self.respond(
-            human_input,
-            conversation_id,
-            is_interrupt
-        )
 
-        if response_text:
-            yield AgentResponseMessage(message=BaseMessage(text=response_text))
+        LLM output is streamed and yielded one sentence at a time, so speech
+        synthesis can start while the rest of the answer is still generating.
+        If the consumer stops early (timeout, failed send), the sentences it
+        was already given are still recorded as the turn.
+        """
+        parts = []
+        spoken = []  # Sentences handed to the consumer
+        buffer = ""
+        completed = False
 
-    async def _load_conversation_history(self):
-        """Load conversation history from DB"""
         try:
-            db_gen = get_db()
-            db = next(db_gen)
-            try:
-                # Get or create conversation
-                conversation = db.query(Conversation).filter(
-                    Conversation.id == self.conversation_id
-                ).first()
-
-                if not conversation:
-                    conversation = Conversation(
-                        id=self.conversation_id,
-                        session_id=str(self.conversation_id),
-                        meta_data={"type": "voice_call", "title": "Voice Call"}
-                    )
-                    db.add(conversation)
-                    db.commit()
-                    db.refresh(conversation)
-                    logger.info(f"Created new conversation: {self.conversation_id}")
-
-                # Load messages
-                messages = db.query(Message).filter(
-                    Message.conversation_id == self.conversation_id
-                ).order_by(Message.created_at).all()
-
-                self.conversation_history = [
-                    {"role": msg.role, "content": msg.content}
-                    for msg in messages
-                ]
-
-                logger.info(f"Loaded {len(self.conversation_history)} messages")
-            finally:
-                db.close()
+            system_prompt, query_embedding, cache_namespace, cached, context_task = (
+                await self._begin_turn(human_input, conversation_id)
+            )
+            if cached is not None:
+                parts.append(cached)
+                spoken.append(cached)
+                yield AgentResponseMessage(message=BaseMessage(text=cached))
+                completed = True
+                await self._finish_turn(human_input, cached)
+                return
+
+            async for delta in rag_service.answer_with_context_streaming(
+                query=human_input,
+                conversation_history=self.conversation_history,
+                system_prompt=system_prompt,
+                use_rag=self.agent_config.use_rag,
+                context_task=context_task
+            ):
+                parts.append(delta)
+                buffer += delta
+
+                # Flush every complete sentence in the buffer (searching from
+                # MIN_SENTENCE_CHARS merges very short ones into the next)
+                match = SENTENCE_END_RE.search(buffer, MIN_SENTENCE_CHARS)
+                while match:
+                    sentence = buffer[:match.end()].strip()
+                    buffer = buffer[match.end():]
+                    if sentence:
+                        spoken.append(sentence)
+                        yield AgentResponseMessage(message=BaseMessage(text=sentence))
+                    match = SENTENCE_END_RE.search(buffer, MIN_SENTENCE_CHARS)
+
+            tail = buffer.strip()
+            if tail:
+                spoken.append(tail)
+                yield AgentResponseMessage(message=BaseMessage(text=tail))
+
+            # Persist the full response once the stream has closed
+            response_text = "".join(parts)
+            if cache_namespace is not None and response_text:
+                semantic_cache.store(cache_namespace, query_embedding, response_text)
+            completed = True
+            await self._finish_turn(human_input, response_text)
+
+            logger.info("Streamed response: %.100s...", response_text)
 
         except Exception as e:
-            logger.error(f"Error loading conversation: {e}")
-
-    async def _save_messages(self, user_input: str, assistant_response: str):
-        """Save messages to DB"""
-        try:
-            db_gen = get_db()
-            db = next(db_gen)
-            try:
-                # Save user message
-                user_msg = Message(
-                    conversation_id=self.conversation_id,
-                    role=MESSAGE_ROLE_USER,
-                    content=user_input
+            logger.error("Error streaming response: %s", e, exc_info=True)
+            if not parts:
+                yield AgentResponseMessage(
+                    message=BaseMessage(text="Извините, произошла ошибка. Попробуйте повторить вопрос.")
                 )
-                db.add(user_msg)
+        finally:
+            # Interrupted mid-answer: keep the part that reached the caller
+            if not completed and spoken:
+                await self._finish_turn(human_input, " ".join(spoken))
+
+    async def _begin_turn(
+        self,
+        human_input: str,
+        conversation_id: str
+    ) -> tuple[Optional[str], Optional[np.ndarray], Optional[tuple], Optional[str], Optional[asyncio.Task]]:
+        """
+        Shared turn setup: history, system prompt, semantic cache lookup and
+        RAG retrieval
+
+        Only the opening question of a conversation uses the semantic cache:
+        later answers depend on earlier turns (and on what this caller said),
+        so they are never served to, or stored for, other callers.
 
-                # Save assistant message
-                assistant_msg = Message(
-                    conversation_id=self.conversation_id,
-                    role=MESSAGE_ROLE_ASSISTANT,
-                    content=assistant_response
+        Returns:
+            Tuple of (system_prompt, query_embedding, cache_namespace, cached_response,
+            context_task). query_embedding is None when the input isn't cached or
+            embedding failed; cache_namespace is None when the turn must not be cached;
+            context_task (for answer_with_context*) is None without RAG or on a cache hit.
+        """
+        # Embedding and retrieval start first so they overlap history/prompt
+        # loading; the vector feeds both the semantic cache and RAG retrieval
+        threshold = self.agent_config.semantic_cache_threshold
+        embedding_task = None
+        if (
+            threshold is not None
+            and not self.conversation_history
+            and semantic_cache.is_cacheable(human_input)
+        ):
+            embedding_task = asyncio.create_task(
+                rag_service.embeddings.generate_embedding(human_input)
+            )
+
+        context_task = None
+        if self.agent_config.use_rag:
+            if embedding_task:
+                context_task = asyncio.create_task(
+                    self._retrieve_after_embedding(human_input, embedding_task)
                 )
-                db.add(assistant_msg)
+            else:
+                context_task = await rag_service.prefetch_context(human_input)
 
-                db.commit()
-            finally:
-                db.close()
+        # Initialize conversation if needed
+        if not self._history_loaded:
+            await self._init_conversation(conversation_id)
 
-        except Exception as e:
-            logger.error(f"Error saving messages: {e}")
+        system_prompt = self._get_system_prompt()
+
+        query_embedding = None
+        if embedding_task:
+            try:
+                query_embedding = await embedding_task
+            except Exception as e:
+                logger.warning("Semantic cache skipped, embedding failed: %s", e)
+
+        # The loaded history may show this is not the opening question after all
+        cache_namespace = None
+        if query_embedding is not None and not self.conversation_history:
+            cache_namespace = (
+                xxhash.xxh3_64_intdigest((system_prompt or "").encode()),
+                self.agent_config.language_code,
+                self.agent_config.use_rag,
+            )
+
+        cached = None
+        if cache_namespace is not None:
+            cached = semantic_cache.lookup(cache_namespace, query_embedding, threshold)
+            if cached is not None:
+                logger.info("Semantic cache hit: %.100s...", cached)
+                if context_task:
+                    context_task.cancel()
+                    context_task = None
+
+        return system_prompt, query_embedding, cache_namespace, cached, context_task
+
+    async def _retrieve_after_embedding(
+        self,
+        human_input: str,
+        embedding_task: asyncio.Task
+    ) -> list:
+        """Retrieve RAG context with the semantic-cache embedding once it's ready"""
+        try:
+            query_embedding = await embedding_task
+        except Exception:
+            # Reported by _begin_turn; retrieval embeds the query itself
+            query_embedding = None
+        return await rag_service.retrieve_context(human_input, query_embedding=query_embedding)
 
-    def _should_end_conversation(self, response: str) -> bool:
+    def _get_system_prompt(self) -> Optional[str]:
+        """
+        Get active system prompt.
+        Served from prompt_service's in-memory copy, which is filled at startup
+        and refreshed whenever the prompt is updated or hot reloaded.
+        """
+        return prompt_service.get_active_prompt_sync()
+
+    async def _finish_turn(self, user_input: str, assistant_response: str):
+        """Record a completed turn in history and DB"""
+        # Save to history
+        self.conversation_history.append({"role": "user", "content": user_input})
+        self.conversation_history.append({"role": "assistant", "content": assistant_response})
+
+        # Until the history load succeeds the conversation row may not exist,
+        # so the messages would only fail their foreign key
+        if not self._history_loaded:
+            logger.warning("Conversation %s not loaded, turn kept in memory only", self.conversation_id)
+            return
+
+        # Queue for the batched background write (off the response path)
+        await message_writer.save_turn(self.conversation_id, user_input, assistant_response)
+
+    async def _init_conversation(self, conversation_id: str):
+        """Bind the agent to a conversation and load its history (once)"""
+        if not self.conversation_id:
+            self.conversation_id = _parse_uuid(conversation_id)
+        await self._load_conversation_history(session_id=conversation_id)
+
+    async def _load_conversation_history(self, session_id: str):
+        """
+        Load conversation history from DB (blocking session work runs in a worker thread).
+        Runs once per agent; a failed load is retried on the next turn.
+        """
+        try:
+            loaded = await asyncio.to_thread(
+                self._read_conversation_history, session_id
+            )
+            # Turns answered while the load was failing are only in memory
+            # (never saved), so the stored ones go in front of them
+            self.conversation_history[:0] = loaded
+            self._history_loaded = True
+            logger.info("Loaded %d messages", len(loaded))
+
+        except Exception as e:
+            logger.error("Error loading conversation: %s", e)
+
+    def _read_conversation_history(self, session_id: str) -> list:
+        """Get or create the conversation and return its messages as history"""
+        # Turns are written by the shared message_writer, so this one-time
+        # read is the agent's only DB use: a short-lived session is enough
+        with SessionLocal() as db, db.begin():
+            # Conversation and its messages in one round trip: no rows means
+            # no conversation, a single row with NULL role means no messages
+            rows = db.execute(
+                select(Message.role, Message.content)
+                .select_from(Conversation)
+                .outerjoin(Message, Message.conversation_id == Conversation.id)
+                .where(Conversation.id == self.conversation_id)
+                .order_by(Message.created_at)
+            ).all()
+
+            if not rows:
+                conversation = Conversation(
+                    id=self.conversation_id,
+                    session_id=session_id,
+                    meta_data={"type": "voice_call", "title": "Voice Call"}
+                )
+                db.add(conversation)
+                logger.info("Created new conversation: %s", self.conversation_id)
+                # A new conversation has no messages yet
+                return []
+
+            return [
+                {"role": role, "content": content}
+                for role, content in rows
+                if role is not None
+            ]
+
+    def should_end_conversation(self, response: str) -> bool:
         """Check if conversation should end"""
         # Simple heuristic - can be improved
-        end_phrases = ["до свидания", "всего доброго", "спасибо за звонок"]
-        return any(phrase in response.lower() for phrase in end_phrases)
+        return END_PHRASES_RE.search(response) is not None
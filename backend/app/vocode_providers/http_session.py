@@ -0,0 +1,60 @@
+"""
+Shared aiohttp session for the Vocode Yandex providers
+Transcriber instances are created per call; sharing one session keeps
+connections to Yandex warm across calls instead of doing a TCP+TLS
+handshake for every request (the synthesizer goes through the shared
+Yandex TTS service client)
+"""
+
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[aiohttp.ClientSession] = None
+
+# Yandex SpeechKit endpoints used through this session
+WARM_UP_URLS = (
+    "https://stt.api.cloud.yandex.net/speech/v1/stt:recognize",
+)
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the shared session, creating it on first use inside the event loop"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10),
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+    return _session
+
+
+async def warm_up(urls: Iterable[str] = WARM_UP_URLS) -> None:
+    """
+    Open keep-alive connections to the Yandex hosts ahead of the first call,
+    so DNS and the TLS handshake are off the first utterance's critical path.
+    Uses HEAD requests - the status is irrelevant, only the connection is kept.
+    """
+    session = get_session()
+
+    async def _touch(url: str) -> None:
+        try:
+            async with session.head(url, timeout=aiohttp.ClientTimeout(total=5)):
+                pass
+        except Exception as e:
+            logger.debug(f"Connection warm-up failed for {url}: {e}")
+
+    await asyncio.gather(*(_touch(url) for url in urls))
+    logger.info("🔥 Vocode provider connections warmed")
+
+
+async def close_session() -> None:
+    """Close the shared session (called on application shutdown)"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
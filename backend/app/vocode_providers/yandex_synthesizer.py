@@ -1,12 +1,17 @@
 """
 Yandex SpeechKit Synthesizer for Vocode
 Uses Streaming API for low-latency text-to-speech
+
+A synthesizer is created per call, but it only holds the voice settings:
+every request goes through the process-wide yandex_streaming_tts_service,
+so all calls share one HTTP/2 connection pool, audio cache and retry policy.
 """
 
 import asyncio
+import bisect
 import logging
-from typing import AsyncGenerator
-import aiohttp
+from contextlib import aclosing
+from typing import AsyncGenerator, List, Tuple, Union
 
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
 from vocode.streaming.models.synthesizer import SynthesizerConfig
@@ -17,6 +22,52 @@ from app.services.yandex_streaming_tts import yandex_streaming_tts_service
 
 logger = logging.getLogger(__name__)
 
+# Bounds concurrent REST syntheses across all calls, so queued requests wait
+# for a slot instead of every in-flight request slowing down together
+_synth_semaphore = asyncio.Semaphore(max(1, settings.YANDEX_SYNTH_CONCURRENCY))
+
+# Typical Russian TTS pace at speed 1.0, used to place the playback position
+# inside a sentence whose audio length is not known yet
+SPOKEN_CHARS_PER_SECOND = 14.0
+
+
+def _message_up_to(
+    message: str,
+    marks: List[Tuple[int, int]],
+    played_bytes: float,
+    chars_per_byte: float
+) -> str:
+    """
+    Text spoken after played_bytes of audio
+
+    Args:
+        message: Full message being synthesized
+        marks: Sorted (audio bytes, text chars) pairs, starting at (0, 0)
+        played_bytes: Audio bytes played so far
+        chars_per_byte: Expected speech rate, used past the last mark
+
+    Returns:
+        Prefix of the message, interpolated linearly between marks and
+        estimated from the speech rate within the sentence still in progress
+    """
+    if played_bytes <= 0:
+        return ""
+
+    i = bisect.bisect_left(marks, (played_bytes,))
+    if i >= len(marks):
+        # Past the last mark: the current sentence's length is unknown until
+        # it finishes, so estimate from the rate measured so far (or the
+        # expected rate before the first sentence is done)
+        last_bytes, last_chars = marks[-1]
+        if last_bytes > 0:
+            chars_per_byte = last_chars / last_bytes
+        estimate = last_chars + int((played_bytes - last_bytes) * chars_per_byte)
+        return message[:min(estimate, len(message))]
+
+    (start_bytes, start_chars), (end_bytes, end_chars) = marks[i - 1], marks[i]
+    fraction = (played_bytes - start_bytes) / (end_bytes - start_bytes)
+    return message[:start_chars + int((end_chars - start_chars) * fraction)]
+
 
 class YandexSynthesizerConfig(SynthesizerConfig):
     """Configuration for Yandex Synthesizer"""
@@ -38,22 +89,18 @@ class YandexSynthesizerConfig(SynthesizerConfig):
 class YandexSynthesizer(BaseSynthesizer[YandexSynthesizerConfig]):
     """
     Yandex SpeechKit Synthesizer for Vocode
-    Uses REST API for speech synthesis
+    Thin facade over the shared Yandex TTS service
     """
 
     def __init__(self, synthesizer_config: YandexSynthesizerConfig):
         super().__init__(synthesizer_config)
 
-        self.api_key = settings.YANDEX_API_KEY
-        if not self.api_key:
+        if not settings.YANDEX_API_KEY:
             raise ValueError("YANDEX_API_KEY is required")
 
-        self.folder_id = settings.YANDEX_FOLDER_ID
-        self.api_url = "https://tts.api.cloud.yandex.net/speech/v1/tts:synthesize"
-
         logger.info(
-            f"YandexSynthesizer initialized: voice={synthesizer_config.voice}, "
-            f"language={synthesizer_config.language_code}"
+            "YandexSynthesizer initialized: voice=%s, language=%s",
+            synthesizer_config.voice, synthesizer_config.language_code
         )
 
     async def create_speech_uncached(
@@ -76,86 +123,70 @@ class YandexSynthesizer(BaseSynthesizer[YandexSynthesizerConfig]):
             SynthesisResult with audio generator
         """
 
-        async def chunk_generator() -> AsyncGenerator[bytes, None]:
-            """Generator that yields audio chunks with streaming"""
+        # Playback position -> text, filled in as audio is synthesized, so an
+        # interrupted message is recorded only up to where it was cut off
+        marks: List[Tuple[int, int]] = [(0, 0)]
+        bytes_per_second = self.synthesizer_config.sampling_rate * 2  # 16-bit mono
+        chars_per_byte = (
+            SPOKEN_CHARS_PER_SECOND * self.synthesizer_config.speed / bytes_per_second
+        )
+
+        async def chunk_generator() -> AsyncGenerator[Union[bytes, memoryview], None]:
+            """
+            Generator that yields audio chunks with streaming.
+            Chunks cut from a complete buffer are zero-copy memoryview slices;
+            the websocket and Vocode output paths accept any bytes-like object.
+            """
             try:
                 if self.synthesizer_config.use_streaming:
-                    # Use streaming TTS for lower latency
+                    # Use streaming TTS for lower latency. aclosing() closes the
+                    # service stream as soon as this generator is closed (e.g. on
+                    # barge-in), which cancels sentence requests still in flight
+                    # instead of leaving them to garbage collection.
                     total_bytes = 0
-                    async for chunk in yandex_streaming_tts_service.synthesize_streaming(
+                    stream = yandex_streaming_tts_service.synthesize_streaming(
                         text=message,
                         voice=self.synthesizer_config.voice,
                         language=self.synthesizer_config.language_code,
                         speed=self.synthesizer_config.speed,
                         emotion=self.synthesizer_config.emotion,
                         chunk_size=chunk_size,
-                    ):
-                        yield chunk
-                        total_bytes += len(chunk)
+                        marks=marks,
+                    )
+                    async with aclosing(stream):
+                        async for chunk in stream:
+                            yield chunk
+                            total_bytes += len(chunk)
 
                     logger.info(
-                        f"🚀 Streaming TTS: {total_bytes} bytes for '{message[:50]}...'"
+                        "🚀 Streaming TTS: %d bytes for '%.50s...'", total_bytes, message
                     )
                 else:
-                    # Fallback to REST API (non-streaming)
-                    audio_data = await self._synthesize_yandex(message)
-
-                    if audio_data:
-                        # Yield in chunks
-                        for i in range(0, len(audio_data), chunk_size):
-                            chunk = audio_data[i:i + chunk_size]
+                    # Whole message in one REST request (no sentence split);
+                    # audio is still forwarded as the response body arrives
+                    total_bytes = 0
+                    config = self.synthesizer_config
+                    stream = yandex_streaming_tts_service.stream_sentence(
+                        message, config.voice, config.language_code, config.speed,
+                        config.emotion, chunk_size, _synth_semaphore,
+                    )
+                    async with aclosing(stream):
+                        async for chunk in stream:
                             yield chunk
+                            total_bytes += len(chunk)
 
-                        logger.info(f"Synthesized {len(audio_data)} bytes for: '{message[:50]}...'")
+                    if total_bytes:
+                        marks.append((total_bytes, len(message)))
+                        logger.info("Synthesized %d bytes for: '%.50s...'", total_bytes, message)
                     else:
-                        logger.warning(f"No audio data for: {message}")
+                        logger.warning("No audio data for: %s", message)
 
             except Exception as e:
-                logger.error(f"Error in chunk generator: {e}", exc_info=True)
+                logger.error("Error in chunk generator: %s", e, exc_info=True)
 
         return SynthesisResult(
             chunk_generator=chunk_generator(),
-            get_message_up_to=lambda seconds: message,  # Return full message
+            get_message_up_to=lambda seconds: _message_up_to(
+                message, marks, seconds * bytes_per_second, chars_per_byte
+            ),
         )
-
-    async def _synthesize_yandex(self, text: str) -> bytes:
-        """Call Yandex TTS API for synthesis"""
-        try:
-            headers = {
-                "Authorization": f"Api-Key {self.api_key}",
-            }
-
-            data = {
-                "text": text,
-                "lang": self.synthesizer_config.language_code,
-                "voice": self.synthesizer_config.voice,
-                "speed": str(self.synthesizer_config.speed),
-                "format": "lpcm",
-                "sampleRateHertz": "16000",
-                "emotion": self.synthesizer_config.emotion,
-            }
-
-            if self.folder_id:
-                data["folderId"] = self.folder_id
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.api_url,
-                    headers=headers,
-                    data=data,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        audio_data = await response.read()
-                        content_type = response.headers.get('Content-Type', 'unknown')
-                        logger.info(f"Yandex TTS response: {len(audio_data)} bytes, Content-Type: {content_type}")
-                        logger.debug(f"Request params: format=lpcm, sampleRateHertz=16000")
-                        return audio_data
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Yandex TTS error {response.status}: {error_text}")
-                        return b""
-
-        except Exception as e:
-            logger.error(f"Error calling Yandex TTS: {e}")
-            return b""
@@ -5,18 +5,48 @@ Simplified version using REST API
 
 import asyncio
 import logging
+import time
 import base64
-from typing import Optional
-import aiohttp
+from typing import Optional, Union
 
+import numpy as np
 from vocode.streaming.transcriber.base_transcriber import BaseAsyncTranscriber, Transcription
 from vocode.streaming.models.transcriber import TranscriberConfig
 from vocode.streaming.models.audio import AudioEncoding
 
 from app.config import settings
+from app.vocode_providers.http_session import get_session
 
 logger = logging.getLogger(__name__)
 
+# Audio segments waiting for recognition (~0.5s each). When full, intake
+# blocks and the websocket handler's input-queue limit starts dropping chunks.
+PENDING_SEGMENTS_MAX = 32
+
+# Recognition requests in flight per transcriber; segments are uploaded
+# concurrently but their transcriptions are still emitted in order
+MAX_CONCURRENT_RECOGNITIONS = 4
+
+# Energy VAD: a buffer that contained speech is flushed as soon as its last
+# 300ms (16kHz, 16-bit) are quieter than SILENCE_RMS, instead of waiting for
+# the segment to fill up or for the input to go quiet for a whole second
+SILENCE_RMS = 500.0
+END_SILENCE_BYTES = 9600
+
+
+def _frame_energy(pcm: Union[bytes, np.ndarray]) -> float:
+    """Mean square of 16-bit PCM samples"""
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+    if not samples.size:
+        return 0.0
+    # One BLAS dot product: no squared temporary array, no per-sample Python
+    return float(np.dot(samples, samples)) / samples.size
+
+
+def _is_silent(pcm: Union[bytes, np.ndarray]) -> bool:
+    """Whether 16-bit PCM audio is below the speech energy threshold"""
+    return _frame_energy(pcm) < SILENCE_RMS * SILENCE_RMS
+
 
 class YandexTranscriberConfig(TranscriberConfig):
     """Configuration for Yandex Transcriber"""
@@ -49,58 +79,159 @@ class YandexTranscriber(BaseAsyncTranscriber[YandexTranscriberConfig]):
         self.folder_id = settings.YANDEX_FOLDER_ID
         self.api_url = "https://stt.api.cloud.yandex.net/speech/v1/stt:recognize"
 
-        # Buffer for accumulating audio
-        self.audio_buffer = bytearray()
+        # Recognition request parts are fixed for the lifetime of the transcriber
+        self._headers = {"Authorization": f"Api-Key {self.api_key}"}
+        self._params = {
+            "lang": transcriber_config.language_code,
+            "format": "lpcm",
+            "sampleRateHertz": "16000",
+        }
+        if self.folder_id:
+            self._params["folderId"] = self.folder_id
+
+        # Buffer for accumulating audio: preallocated bytes plus a write
+        # position, so appending frames never reallocates (the capacity
+        # leaves room for the frame that crosses min_audio_length)
         self.min_audio_length = 16000  # Minimum 1 second of audio
+        self._segment_capacity = 2 * self.min_audio_length
+        self.audio_buffer = np.empty(self._segment_capacity, dtype=np.uint8)
+        self._write_pos = 0
+        self._heard_speech = False  # Buffer contains speech (VAD)
+        self._recognize_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RECOGNITIONS)
 
         # Initialize base class attributes
         self._ended = False
 
-        logger.info(f"YandexTranscriber initialized: language={transcriber_config.language_code}")
+        logger.info("YandexTranscriber initialized: language=%s", transcriber_config.language_code)
 
     async def _run_loop(self):
-        """Main transcription loop"""
+        """
+        Main transcription loop
+
+        Audio intake and recognition run as separate loops: each flushed
+        segment starts its Yandex request right away, and a worker emits the
+        results in segment order. Input keeps being consumed while requests
+        are in flight.
+        """
+        pending: asyncio.Queue = asyncio.Queue(maxsize=PENDING_SEGMENTS_MAX)
+        worker = asyncio.create_task(self._transcription_worker(pending))
+
         try:
             while not self._ended:
                 try:
-                    # Get audio chunk from input queue
+                    # Get audio chunk from input queue. The 1s silence timeout
+                    # only matters when there is audio to flush - with an empty
+                    # buffer just wait for input instead of waking up every second.
                     chunk = await asyncio.wait_for(
                         self.input_queue.get(),
-                        timeout=1.0
+                        timeout=1.0 if self._write_pos else None
                     )
 
-                    # Accumulate audio
-                    self.audio_buffer.extend(chunk)
+                    # None is the shutdown sentinel put by terminate()
+                    if chunk is None:
+                        break
 
-                    # When we have enough audio, transcribe it
-                    if len(self.audio_buffer) >= self.min_audio_length:
-                        await self._transcribe_buffer()
+                    # Accumulate audio, plus any chunks that are already queued
+                    # (Vocode feeds small frames, so several are often waiting)
+                    self._append_audio(chunk)
+                    self._drain_ready_chunks()
+
+                    # When we have enough audio, or the speaker has paused,
+                    # transcribe it
+                    if self._write_pos >= self.min_audio_length or self._utterance_ended():
+                        await self._flush_buffer(pending)
 
                 except asyncio.TimeoutError:
-                    # No audio for 1 second
-                    # If we have accumulated audio, transcribe it
-                    if len(self.audio_buffer) > 0:
-                        await self._transcribe_buffer()
-                    continue
+                    # No audio for 1 second - transcribe what we have
+                    await self._flush_buffer(pending)
 
         except Exception as e:
-            logger.error(f"Error in transcription loop: {e}", exc_info=True)
-
-    async def _transcribe_buffer(self):
-        """Transcribe accumulated audio buffer"""
-        if len(self.audio_buffer) == 0:
+            logger.error("Error in transcription loop: %s", e, exc_info=True)
+        finally:
+            worker.cancel()
+            # Drop recognitions nobody will read
+            while not pending.empty():
+                pending.get_nowait().cancel()
+
+    def _append_audio(self, chunk: bytes):
+        """Copy an audio frame into the segment buffer at the write position"""
+        end = self._write_pos + len(chunk)
+        if end > len(self.audio_buffer):
+            # Oversized input frame - grow once (rare)
+            grown = np.empty(max(end, 2 * len(self.audio_buffer)), dtype=np.uint8)
+            grown[:self._write_pos] = self.audio_buffer[:self._write_pos]
+            self.audio_buffer = grown
+        self.audio_buffer[self._write_pos:end] = np.frombuffer(chunk, dtype=np.uint8)
+        self._write_pos = end
+
+    def _drain_ready_chunks(self):
+        """Append queued chunks without waiting, up to one segment of audio"""
+        while self._write_pos < self.min_audio_length:
+            try:
+                chunk = self.input_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if chunk is None:
+                # Leave the sentinel for the main loop
+                self.input_queue.put_nowait(None)
+                return
+            self._append_audio(chunk)
+
+    def _utterance_ended(self) -> bool:
+        """Speech was buffered and is now followed by a trailing pause"""
+        if self._write_pos < END_SILENCE_BYTES:
+            return False
+
+        # The tail is checked in place (a view, no copy)
+        tail = self.audio_buffer[self._write_pos - END_SILENCE_BYTES:self._write_pos]
+        if not _is_silent(tail):
+            self._heard_speech = True
+            return False
+        return self._heard_speech
+
+    def terminate(self):
+        """Stop the transcription loop without waiting for a timeout"""
+        self._ended = True
+        self.input_queue.put_nowait(None)
+        return super().terminate()
+
+    async def _flush_buffer(self, pending: asyncio.Queue):
+        """Start recognition of the accumulated audio (waits if the worker is behind)"""
+        if not self._write_pos:
             return
 
+        # Hand over a view of the filled part and start a fresh buffer - no
+        # copy of the audio (the request may still be reading this one while
+        # the next segment is recorded). aiohttp sends a memoryview as is.
+        segment = memoryview(self.audio_buffer[:self._write_pos])
+        self.audio_buffer = np.empty(self._segment_capacity, dtype=np.uint8)
+        self._write_pos = 0
+        self._heard_speech = False
+
+        recognition = asyncio.create_task(self._recognize_yandex(segment))
+
+        if pending.full():
+            started = time.monotonic()
+            await pending.put(recognition)
+            waited_ms = (time.monotonic() - started) * 1000
+            if waited_ms > 100:
+                logger.warning("Transcription backlog: intake blocked for %.0fms", waited_ms)
+        else:
+            pending.put_nowait(recognition)
+
+    async def _transcription_worker(self, pending: asyncio.Queue):
+        """Emit recognition results in segment order"""
+        while True:
+            recognition = await pending.get()
+            await self._emit_transcription(recognition)
+
+    async def _emit_transcription(self, recognition: asyncio.Task):
+        """Wait for one segment's recognition and send the result to Vocode"""
         try:
-            # Prepare audio data
-            audio_data = bytes(self.audio_buffer)
-            self.audio_buffer.clear()
-
-            # Call Yandex API
-            text = await self._recognize_yandex(audio_data)
+            text = await recognition
 
             if text and text.strip():
-                logger.info(f"Transcribed: {text}")
+                logger.info("Transcribed: %s", text)
 
                 # Send transcription result
                 transcription = Transcription(
@@ -111,40 +242,25 @@ class YandexTranscriber(BaseAsyncTranscriber[YandexTranscriberConfig]):
                 self.output_queue.put_nowait(transcription)
 
         except Exception as e:
-            logger.error(f"Error transcribing buffer: {e}", exc_info=True)
+            logger.error("Error transcribing buffer: %s", e, exc_info=True)
 
-    async def _recognize_yandex(self, audio_data: bytes) -> Optional[str]:
+    async def _recognize_yandex(self, audio_data: Union[bytes, memoryview]) -> Optional[str]:
         """Call Yandex SpeechKit API for recognition"""
         try:
-            headers = {
-                "Authorization": f"Api-Key {self.api_key}",
-            }
-
-            params = {
-                "lang": self.transcriber_config.language_code,
-                "format": "lpcm",
-                "sampleRateHertz": "16000",
-            }
-
-            if self.folder_id:
-                params["folderId"] = self.folder_id
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.api_url,
-                    headers=headers,
-                    params=params,
-                    data=audio_data,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result.get("result", "")
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Yandex API error {response.status}: {error_text}")
-                        return None
+            async with self._recognize_semaphore, get_session().post(
+                self.api_url,
+                headers=self._headers,
+                params=self._params,
+                data=audio_data
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return result.get("result", "")
+                else:
+                    error_text = await response.text()
+                    logger.error("Yandex API error %s: %s", response.status, error_text)
+                    return None
 
         except Exception as e:
-            logger.error(f"Error calling Yandex API: {e}")
+            logger.error("Error calling Yandex API: %s", e)
             return None
@@ -2,10 +2,11 @@
 Pytest fixtures and configuration
 """
 
+import httpx
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.database import Base, get_db
@@ -13,39 +14,69 @@ from app.config import settings
 
 
 # Test database URL (use in-memory SQLite for testing)
-TEST_DATABASE_URL = "sqlite:///./test.db"
+TEST_DATABASE_URL = "sqlite://"
 
 
-@pytest.fixture(scope="function")
-def test_db():
+@pytest.fixture(scope="session")
+def test_engine():
     """
-    Create a test database for each test function.
+    Create the test database and its schema once per test session.
     """
-    # Create test database engine
+    # One shared in-memory connection (StaticPool), so every session and
+    # the worker threads running DB work (asyncio.to_thread) see the same database
     engine = create_engine(
         TEST_DATABASE_URL,
-        connect_args={"check_same_thread": False}  # Needed for SQLite
+        connect_args={"check_same_thread": False},  # Needed for SQLite
+        poolclass=StaticPool
     )
 
+    # pysqlite manages transactions itself and breaks SAVEPOINT; let
+    # SQLAlchemy emit BEGIN instead
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     # Create all tables
     Base.metadata.create_all(bind=engine)
 
-    # Create session
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    db = TestingSessionLocal()
+    yield engine
+
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def test_db(test_engine):
+    """
+    Provide a session whose changes are rolled back after each test function.
+    Sync, like app.database.get_db - the app has no async sessions.
+    """
+    # Commits inside the test only release savepoints; the outer
+    # transaction is rolled back at teardown, so no DDL runs per test
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    db = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint"
+    )
 
     try:
         yield db
     finally:
         db.close()
-        # Drop all tables after test
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture(scope="function")
-def client(test_db):
+async def client(test_db):
     """
-    Create a test client with test database.
+    Create an async test client with test database.
+    Requests go straight to the ASGI app on the test's event loop.
     """
     # Override get_db dependency
     def override_get_db():
@@ -56,9 +87,11 @@ def client(test_db):
 
     app.dependency_overrides[get_db] = override_get_db
 
-    # Create test client
-    with TestClient(app) as test_client:
-        yield test_client
+    # Create test client (the lifespan runs startup/shutdown like TestClient did)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+            yield test_client
 
     # Clean up
     app.dependency_overrides.clear()
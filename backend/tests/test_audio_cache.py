@@ -0,0 +1,64 @@
+"""
+Tests for the synthesized audio LRU cache
+"""
+
+import pytest
+
+from app.services.audio_cache import AudioCache
+
+
+@pytest.mark.unit
+def test_get_and_put():
+    """Stored audio is returned for its key, other keys miss"""
+    cache = AudioCache()
+    key = AudioCache.make_key("Добрый день", "alena", "ru-RU", 1.0, "neutral")
+    cache.put(key, b"\x01\x02")
+
+    assert cache.get(key) == b"\x01\x02"
+    assert cache.get(AudioCache.make_key("Добрый вечер", "alena", "ru-RU", 1.0, "neutral")) is None
+
+
+@pytest.mark.unit
+def test_make_key_depends_on_every_part():
+    """Same text with other voice settings is a different entry"""
+    key = AudioCache.make_key("Добрый день", "alena", "ru-RU", 1.0, "neutral")
+
+    assert key == AudioCache.make_key("Добрый день", "alena", "ru-RU", 1.0, "neutral")
+    assert key != AudioCache.make_key("Добрый день", "filipp", "ru-RU", 1.0, "neutral")
+    assert key != AudioCache.make_key("Добрый день", "alena", "ru-RU", 1.2, "neutral")
+
+
+@pytest.mark.unit
+def test_evicts_least_recently_used():
+    """Over the byte budget, the least recently used entry goes first"""
+    cache = AudioCache(max_bytes=10)
+    cache.put(1, b"a" * 4)
+    cache.put(2, b"b" * 4)
+    cache.get(1)  # 2 is now least recently used
+    cache.put(3, b"c" * 4)
+
+    assert cache.get(2) is None
+    assert cache.get(1) == b"a" * 4
+    assert cache.get(3) == b"c" * 4
+    assert len(cache) == 2
+
+
+@pytest.mark.unit
+def test_replacing_entry_updates_size():
+    """Overwriting a key doesn't count its old audio against the budget"""
+    cache = AudioCache(max_bytes=10)
+    cache.put(1, b"a" * 6)
+    cache.put(1, b"a" * 6)
+    cache.put(2, b"b" * 4)
+
+    assert len(cache) == 2
+
+
+@pytest.mark.unit
+def test_empty_and_oversized_audio_not_cached():
+    """Empty results and audio larger than the whole budget are skipped"""
+    cache = AudioCache(max_bytes=10)
+    cache.put(1, b"")
+    cache.put(2, b"x" * 11)
+
+    assert len(cache) == 0
@@ -6,9 +6,9 @@ import pytest
 
 
 @pytest.mark.unit
-def test_health_check(client):
+async def test_health_check(client):
     """Test basic health check endpoint"""
-    response = client.get("/api/health")
+    response = await client.get("/api/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
@@ -17,9 +17,9 @@ def test_health_check(client):
 
 
 @pytest.mark.unit
-def test_health_check_database(client):
+async def test_health_check_database(client):
     """Test database health check endpoint"""
-    response = client.get("/api/health/db")
+    response = await client.get("/api/health/db")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
@@ -27,9 +27,9 @@ def test_health_check_database(client):
 
 
 @pytest.mark.unit
-def test_root_endpoint(client):
+async def test_root_endpoint(client):
     """Test root endpoint"""
-    response = client.get("/")
+    response = await client.get("/")
     assert response.status_code == 200
     data = response.json()
     assert "message" in data
@@ -0,0 +1,88 @@
+"""
+Tests for the upstream HTTP retry helper
+"""
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.services import http_retry
+from app.services.http_retry import RetryableStatusError, send_with_retry
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Retry immediately instead of sleeping"""
+    monkeypatch.setattr(http_retry, "_backoff", lambda retry_state: 0)
+
+
+def mock_client(*outcomes):
+    """Client answering each request with the next status code (or raising an exception)"""
+    calls = []
+
+    def handler(request):
+        outcome = outcomes[len(calls)]
+        calls.append(request)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, request=request)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+@pytest.mark.unit
+async def test_retries_transient_status():
+    """503 is retried until a successful response"""
+    client, calls = mock_client(503, 503, 200)
+    async with client:
+        response = await send_with_retry(lambda: client.get("http://upstream/"))
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+@pytest.mark.unit
+async def test_retries_transport_error():
+    """Connection errors are retried"""
+    client, calls = mock_client(httpx.ConnectError("refused"), 200)
+    async with client:
+        response = await send_with_retry(lambda: client.get("http://upstream/"))
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+async def test_client_error_returned_without_retry():
+    """Non-retryable statuses come back as-is for raise_for_status"""
+    client, calls = mock_client(400, 200)
+    async with client:
+        response = await send_with_retry(lambda: client.get("http://upstream/"))
+
+    assert response.status_code == 400
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+async def test_gives_up_after_attempts():
+    """The last retryable error is raised once attempts run out"""
+    client, calls = mock_client(429, 429, 429, 200)
+    async with client:
+        with pytest.raises(RetryableStatusError):
+            await send_with_retry(lambda: client.get("http://upstream/"), attempts=3)
+
+    assert len(calls) == 3
+
+
+@pytest.mark.unit
+def test_retry_after_is_capped():
+    """A server-provided Retry-After is honored up to MAX_RETRY_AFTER"""
+    def retry_state(retry_after):
+        request = httpx.Request("GET", "http://upstream/")
+        response = httpx.Response(429, headers={"Retry-After": retry_after}, request=request)
+        error = RetryableStatusError("429", request=request, response=response)
+        return SimpleNamespace(outcome=SimpleNamespace(exception=lambda: error))
+
+    assert http_retry._wait(retry_state("0.5")) == 0.5
+    assert http_retry._wait(retry_state("120")) == http_retry.MAX_RETRY_AFTER
@@ -0,0 +1,92 @@
+"""
+Tests for batched message persistence
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.constants import MESSAGE_ROLE_USER, MESSAGE_ROLE_ASSISTANT
+from app.models.message import Message
+from app.services import message_writer as message_writer_module
+from app.services.message_writer import MessageWriter
+
+
+@pytest.fixture
+def writer_db(test_db, monkeypatch):
+    """
+    Point the writer's sessions at the test connection, inside the test's
+    transaction, so its commits are rolled back with the test.
+    """
+    session_factory = sessionmaker(
+        bind=test_db.get_bind(),
+        join_transaction_mode="create_savepoint"
+    )
+    monkeypatch.setattr(message_writer_module, "SessionLocal", session_factory)
+    return test_db
+
+
+def saved_messages(db, conversation_id):
+    """(role, content) of a conversation's messages in history order"""
+    return db.query(Message.role, Message.content).filter(
+        Message.conversation_id == conversation_id
+    ).order_by(Message.created_at).all()
+
+
+@pytest.mark.unit
+async def test_turns_saved_in_order(writer_db):
+    """Each reply is ordered after its question, turns in the order queued"""
+    conversation_id = uuid.uuid4()
+    writer = MessageWriter()
+
+    await writer.save_turn(conversation_id, "Вы работаете сегодня?", "Да, до 23:00.")
+    await writer.save_turn(conversation_id, "А завтра?", "Завтра тоже.")
+    await writer.aclose()
+
+    assert saved_messages(writer_db, conversation_id) == [
+        (MESSAGE_ROLE_USER, "Вы работаете сегодня?"),
+        (MESSAGE_ROLE_ASSISTANT, "Да, до 23:00."),
+        (MESSAGE_ROLE_USER, "А завтра?"),
+        (MESSAGE_ROLE_ASSISTANT, "Завтра тоже."),
+    ]
+
+
+@pytest.mark.unit
+async def test_aclose_drains_queue(writer_db):
+    """aclose() writes queued rows without waiting out the batch window"""
+    conversation_id = uuid.uuid4()
+    writer = MessageWriter(max_wait=60)
+
+    await writer.save_turn(conversation_id, "Здравствуйте", "Добрый день!")
+    await writer.aclose()
+
+    assert len(saved_messages(writer_db, conversation_id)) == 2
+
+
+@pytest.mark.unit
+async def test_full_queue_writes_directly(writer_db):
+    """With no room in the queue, the turn is written before save_turn returns"""
+    conversation_id = uuid.uuid4()
+    writer = MessageWriter(max_pending=1)
+
+    await writer.save_turn(conversation_id, "Здравствуйте", "Добрый день!")
+
+    assert len(saved_messages(writer_db, conversation_id)) == 2
+    await writer.aclose()
+
+
+@pytest.mark.unit
+async def test_failed_batch_falls_back_to_rows(writer_db):
+    """A bad row doesn't drop the rest of its batch"""
+    good_id = uuid.uuid4()
+    bad_id = uuid.uuid4()
+    writer = MessageWriter(max_wait=60)
+
+    await writer.save_turn(good_id, "Здравствуйте", "Добрый день!")
+    # content is NOT NULL, so this reply fails to insert
+    await writer.save_turn(bad_id, "Алло?", None)
+    await writer.aclose()
+
+    assert len(saved_messages(writer_db, good_id)) == 2
+    assert saved_messages(writer_db, bad_id) == [(MESSAGE_ROLE_USER, "Алло?")]
@@ -6,9 +6,9 @@ import pytest
 
 
 @pytest.mark.unit
-def test_get_available_variables(client):
+async def test_get_available_variables(client):
     """Test getting available template variables"""
-    response = client.get("/api/prompts/variables/available")
+    response = await client.get("/api/prompts/variables/available")
     assert response.status_code == 200
 
     data = response.json()
@@ -23,9 +23,9 @@ def test_get_available_variables(client):
 
 
 @pytest.mark.unit
-def test_preview_prompt(client, sample_prompt_content):
+async def test_preview_prompt(client, sample_prompt_content):
     """Test prompt preview with variable substitution"""
-    response = client.post(
+    response = await client.post(
         "/api/prompts/preview",
         json={"content": sample_prompt_content}
     )
@@ -42,9 +42,9 @@ def test_preview_prompt(client, sample_prompt_content):
 
 
 @pytest.mark.integration
-def test_get_all_prompts(client):
+async def test_get_all_prompts(client):
     """Test getting all prompts"""
-    response = client.get("/api/prompts/")
+    response = await client.get("/api/prompts/")
     assert response.status_code == 200
 
     data = response.json()
@@ -58,3 +58,16 @@ def test_get_all_prompts(client):
         assert "content" in prompt
         assert "version" in prompt
         assert "is_active" in prompt
+
+
+@pytest.mark.unit
+def test_render_prompt_keeps_unknown_placeholders():
+    """Test that only known variables are substituted"""
+    from app.services.prompt_service import prompt_service
+    from app.config import settings
+
+    rendered = prompt_service.render_prompt("{restaurant_name} {unknown} {{date}}")
+
+    assert rendered.startswith(settings.RESTAURANT_NAME)
+    assert "{unknown}" in rendered
+    assert "{date}" not in rendered
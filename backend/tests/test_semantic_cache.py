@@ -0,0 +1,95 @@
+"""
+Tests for the semantic response cache
+"""
+
+import numpy as np
+import pytest
+
+from app.services import semantic_cache as semantic_cache_module
+from app.services.semantic_cache import SemanticCache
+
+
+def unit(*values):
+    """Unit-length float32 vector"""
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.mark.unit
+def test_lookup_hit_and_miss():
+    """Similar queries hit, dissimilar ones miss"""
+    cache = SemanticCache()
+    cache.store("ns", unit(1, 0, 0), "Мы работаем с 10 до 22")
+
+    assert cache.lookup("ns", unit(1, 0.05, 0), threshold=0.9) == "Мы работаем с 10 до 22"
+    assert cache.lookup("ns", unit(0, 1, 0), threshold=0.9) is None
+
+
+@pytest.mark.unit
+def test_lookup_returns_most_similar():
+    """The best-scoring entry wins"""
+    cache = SemanticCache()
+    cache.store("ns", unit(1, 0, 0), "first")
+    cache.store("ns", unit(0, 1, 0), "second")
+
+    assert cache.lookup("ns", unit(0.1, 1, 0), threshold=0.9) == "second"
+
+
+@pytest.mark.unit
+def test_namespaces_are_isolated():
+    """An answer cached under one namespace is not served from another"""
+    cache = SemanticCache()
+    cache.store(("prompt-a", "ru-RU"), unit(1, 0, 0), "answer")
+
+    assert cache.lookup(("prompt-b", "ru-RU"), unit(1, 0, 0), threshold=0.9) is None
+    assert cache.lookup(("prompt-a", "en-US"), unit(1, 0, 0), threshold=0.9) is None
+    assert cache.lookup(("prompt-a", "ru-RU"), unit(1, 0, 0), threshold=0.9) == "answer"
+
+
+@pytest.mark.unit
+def test_entries_expire(monkeypatch):
+    """Entries are not served after their TTL"""
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache_module.time, "monotonic", lambda: now[0])
+
+    cache = SemanticCache(ttl=60)
+    cache.store("ns", unit(1, 0, 0), "answer")
+
+    now[0] += 59
+    assert cache.lookup("ns", unit(1, 0, 0), threshold=0.9) == "answer"
+
+    now[0] += 2
+    assert cache.lookup("ns", unit(1, 0, 0), threshold=0.9) is None
+
+
+@pytest.mark.unit
+def test_oldest_entries_evicted():
+    """Storing past max_entries drops the oldest entries"""
+    cache = SemanticCache(max_entries=2)
+    cache.store("ns", unit(1, 0, 0), "first")
+    cache.store("ns", unit(0, 1, 0), "second")
+    cache.store("ns", unit(0, 0, 1), "third")
+
+    assert cache.lookup("ns", unit(1, 0, 0), threshold=0.9) is None
+    assert cache.lookup("ns", unit(0, 1, 0), threshold=0.9) == "second"
+    assert cache.lookup("ns", unit(0, 0, 1), threshold=0.9) == "third"
+
+
+@pytest.mark.unit
+def test_short_queries_not_cacheable():
+    """One- and two-word replies depend on the conversation"""
+    cache = SemanticCache(min_words=3)
+
+    assert not cache.is_cacheable("да")
+    assert not cache.is_cacheable("нет, спасибо")
+    assert cache.is_cacheable("когда вы работаете")
+
+
+@pytest.mark.unit
+def test_clear():
+    """clear() drops every namespace"""
+    cache = SemanticCache()
+    cache.store("ns", unit(1, 0, 0), "answer")
+    cache.clear()
+
+    assert cache.lookup("ns", unit(1, 0, 0), threshold=0.9) is None
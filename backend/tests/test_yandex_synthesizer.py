@@ -0,0 +1,57 @@
+"""
+Tests for mapping synthesized audio back to spoken text
+"""
+
+import pytest
+
+from app.vocode_providers.yandex_synthesizer import _message_up_to
+
+
+MESSAGE = "Добрый день. Чем могу помочь?"
+# 1 char per 100 bytes, for round numbers
+RATE = 0.01
+
+
+@pytest.mark.unit
+def test_nothing_played():
+    """No audio played means nothing was said"""
+    assert _message_up_to(MESSAGE, [(0, 0)], 0, RATE) == ""
+
+
+@pytest.mark.unit
+def test_first_sentence_in_progress():
+    """An interruption before any sentence finished is estimated from the rate"""
+    assert _message_up_to(MESSAGE, [(0, 0)], 500, RATE) == MESSAGE[:5]
+
+
+@pytest.mark.unit
+def test_estimate_capped_at_message_length():
+    """The estimate never runs past the end of the message"""
+    assert _message_up_to(MESSAGE, [(0, 0)], 10_000_000, RATE) == MESSAGE
+
+
+@pytest.mark.unit
+def test_interpolates_between_marks():
+    """Within a finished sentence the position is interpolated linearly"""
+    marks = [(0, 0), (2400, 12), (6000, 29)]
+
+    assert _message_up_to(MESSAGE, marks, 1200, RATE) == MESSAGE[:6]
+    assert _message_up_to(MESSAGE, marks, 2400, RATE) == "Добрый день."
+    assert _message_up_to(MESSAGE, marks, 6000, RATE) == MESSAGE
+
+
+@pytest.mark.unit
+def test_later_sentence_uses_measured_rate():
+    """Past the last mark, the rate measured on finished sentences is used"""
+    # 12 chars took 2400 bytes: 0.005 chars per byte, not the default RATE
+    marks = [(0, 0), (2400, 12)]
+
+    assert _message_up_to(MESSAGE, marks, 3400, RATE) == MESSAGE[:17]
+
+
+@pytest.mark.unit
+def test_finished_message_returned_whole():
+    """Once the whole message was synthesized and played, all of it was said"""
+    marks = [(0, 0), (6000, len(MESSAGE))]
+
+    assert _message_up_to(MESSAGE, marks, 7000, RATE) == MESSAGE